@@ -4,6 +4,9 @@ import plotly.express as px
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from element_dataset import SUBSHELLS, load_dataset
+from zeff import zeff_table
+
 #---------------------------------------
 # 한국어 컬럼명 및 추가 속성
 column_name_map = {
@@ -16,20 +19,26 @@ column_name_map = {
     'Group': '족'
 }
 
+# 유효 핵전하 (슬레이터 규칙): 가장 바깥 전자, 그리고 사이드바에서 고른 부껍질의 전자
+zeff_properties = {
+    'Effective_Nuclear_Charge': '유효 핵전하 (가장 바깥 전자)',
+    'Subshell_Zeff': '유효 핵전하 (선택한 부껍질)'
+}
+
 # 그래프 옵션 (영문 -> 한글)
 graph_options = {
     'Atomic_Number': '원자번호',
     'Atomic_Mass': '원자량',
     'Atomic_Radius': '원자 반지름',
     'Ionization_Energy': '이온화 에너지',
-    'Electronegativity': '전기음성도(파울링 값)'
+    'Electronegativity': '전기음성도(파울링 값)',
+    **zeff_properties
 }
 
-# 추가로 포함할 속성들(가상 데이터)
+# 추가로 포함할 속성들 (전자배치에서 계산)
 # 유효 핵전하(Effective Nuclear Charge), 전자배치(Electronic Configuration), 원자가 전자수(Number of Electrons)
-# 여기서는 간단히 가상 데이터를 생성하거나 Atomic_Number 이용
 additional_properties = {
-    'Effective_Nuclear_Charge': '유효 핵전하',
+    **zeff_properties,
     'Number_of_Electrons': '원자가 전자수',
     'Electron_Configuration': '전자배치'
 }
@@ -37,44 +46,39 @@ additional_properties = {
 # 전체 속성 리스트 (추가 속성 포함)
 all_properties = {**graph_options, **additional_properties}
 
+# 원소 데이터: 118개 원소 전체를 표준 데이터셋(element_dataset)에서 읽고, 파생 속성은 표 전체에 대해
+# 한 번에(벡터 연산) 계산한다. st.cache_data로 한 번만 계산한다.
 @st.cache_data
 def load_element_data():
-    data = {
-        'Element': ['H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
-                    'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar', 'K', 'Ca'],
-        'Symbol': ['H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
-                   'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar', 'K', 'Ca'],
-        'Atomic_Number': range(1, 21),
-        'Atomic_Mass': [1.008, 4.0026, 6.94, 9.0122, 10.81, 12.011, 14.007, 15.999, 18.998, 20.180,
-                        22.990, 24.305, 26.982, 28.085, 30.974, 32.06, 35.45, 39.948, 39.0983, 40.078],
-        'Atomic_Radius': [53, 31, 167, 112, 87, 67, 56, 48, 42, 38,
-                          190, 145, 118, 111, 98, 88, 79, 71, 243, 194],
-        'Ionization_Energy': [1312, 2372, 520, 899, 800, 1086, 1402, 1314, 1681, 2081,
-                              496, 738, 578, 787, 1012, 1000, 1251, 1521, 419, 590],
-        'Electronegativity': [2.20, None, 0.98, 1.57, 2.04, 2.55, 3.04, 3.44, 3.98, None,
-                              0.93, 1.31, 1.61, 1.90, 2.19, 2.58, 3.16, None, 0.82, 1.00],
-        'Period': [1, 1, 2, 2, 2, 2, 2, 2, 2, 2,
-                   3, 3, 3, 3, 3, 3, 3, 3, 4, 4],
-        'Group': [1, 18, 1, 2, 13, 14, 15, 16, 17, 18,
-                  1, 2, 13, 14, 15, 16, 17, 18, 1, 2]
-    }
-    df = pd.DataFrame(data)
-    # 유효 핵전하 (가상): 원자번호 * 0.85 정도로 가정
-    df['Effective_Nuclear_Charge'] = df['Atomic_Number'] * 0.85
-    # 전자배치(간단히 대표 형태로)
-    electron_config = [
-        "1s1", "1s2", "1s2 2s1", "1s2 2s2", "1s2 2s2 2p1", 
-        "1s2 2s2 2p2", "1s2 2s2 2p3", "1s2 2s2 2p4", "1s2 2s2 2p5", "1s2 2s2 2p6",
-        "1s2 2s2 2p6 3s1", "1s2 2s2 2p6 3s2", "1s2 2s2 2p6 3s2 3p1", "1s2 2s2 2p6 3s2 3p2", 
-        "1s2 2s2 2p6 3s2 3p3", "1s2 2s2 2p6 3s2 3p4", "1s2 2s2 2p6 3s2 3p5", "1s2 2s2 2p6 3s2 3p6",
-        "1s2 2s2 2p6 3s2 3p6 4s1", "1s2 2s2 2p6 3s2 3p6 4s2"
-    ]
-    df['Electron_Configuration'] = electron_config
-    # 원자가 전자수: 중성 원자 가정 -> 원자가 전자수 = 원자번호
-    df['Number_of_Electrons'] = df['Atomic_Number']
+    dataset = load_dataset()
+    df = pd.DataFrame({
+        'Element': dataset['Symbol'].astype(str),
+        'Symbol': dataset['Symbol'].astype(str),
+        'Name': dataset['Name'].astype(str),
+        'Atomic_Number': dataset['Atomic_Number'],
+        'Atomic_Mass': dataset['Atomic_Mass'],
+        'Atomic_Radius': dataset['Atomic_Radius'],
+        'Ionization_Energy': dataset['Ionization_Energy'],
+        'Electronegativity': dataset['Electronegativity'],
+        # 주기·족·구역은 주기율표 배치에서 (f 구역 원소는 족이 없다)
+        'Period': dataset['Period'],
+        'Group': dataset['Group'],
+        'Block': dataset['Block'].astype(str),
+    })
+    # 유효 핵전하: 가장 바깥 전자에 대한 슬레이터 규칙 값 (zeff, 데이터셋의 전자 점유 행렬로 계산)
+    df['Effective_Nuclear_Charge'] = zeff_table(dataset)['Outermost']
+    # 전자배치 (비활성 기체 코어 표기)
+    df['Electron_Configuration'] = dataset['Electron_Configuration'].astype(str)
+    # 원자가 전자수: 전자배치에서 계산 (주족 원소만, 18족은 0)
+    df['Number_of_Electrons'] = dataset['Valence_Electrons']
 
     return df
 
+# 모든 원소 x 모든 부껍질의 유효 핵전하 (전자가 없는 부껍질은 NaN), 행렬 연산 한 번으로 계산
+@st.cache_data
+def load_subshell_zeff():
+    return zeff_table(load_dataset())[list(SUBSHELLS)]
+
 df = load_element_data()
 
 #---------------------------------------
@@ -171,7 +175,7 @@ def visualization_page():
     st.header("[시각화 단계] 데이터 속성을 선택하여 그래프 만들기")
     st.write("**원소 데이터 확인하기**")
 
-    df_ko = df.rename(columns=column_name_map)
+    df_ko = df.rename(columns={**column_name_map, **additional_properties})
     df_ko['원소'] = df['Element']  # 원소명 컬럼 추가
     st.dataframe(df_ko)
 
@@ -215,7 +219,7 @@ def visualization_page():
             hover_data=['Element', 'Symbol']
         )
 
-    st.plotly_chart(fig)
+    st.plotly_chart(fig, key="visualization_chart")
 
     # 패턴 서술
     st.write("위 그래프를 보고 패턴을 서술하세요 (자유 응답):")
@@ -242,11 +246,12 @@ def interpretation_page():
     st.header("[해석 단계] 전자배치 및 유효 핵전하와의 연계 해석")
 
     # 원소 데이터 (한글 컬럼) 준비
-    df_ko = df.rename(columns=column_name_map)
+    df_ko = df.rename(columns={**column_name_map, **additional_properties})
     df_ko['원소'] = df['Element']
     # 전기음성도(파울링 값) 칼럼 이미 있음
     # 인터랙티브 주기율표에 사용할 속성 선택
-    prop_list = list(all_properties.values())
+    # 점 크기로 나타내므로 수치형 속성만 (전자배치 제외)
+    prop_list = [label for key, label in all_properties.items() if key != 'Electron_Configuration']
     selected_property = st.selectbox("관찰할 속성 선택", prop_list, key="interpret_selected_property")
     inv_all_props = {v: k for k,v in all_properties.items()}
     selected_eng_property = inv_all_props[selected_property]
@@ -256,8 +261,9 @@ def interpretation_page():
 
     # 주기율표 인터랙티브 시각화 (snippet 반영)
     # 여기서는 x를 'Group'으로, y를 'Period'로 해서 주기율표 형태를 구성
+    # 값이 없는 원소(NaN)는 점 크기로 나타낼 수 없으므로 제외
     fig = px.scatter(
-        df_ko,
+        df_ko.dropna(subset=[selected_property]) if selected_property in df_ko else df_ko,
         x="족",
         y="주기",
         size=selected_property,
@@ -269,7 +275,7 @@ def interpretation_page():
         title=f"주기율표 - {selected_property}"
     )
     fig.update_yaxes(autorange="reversed")  # 주기율표 형식으로 Y축 반전
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key="interpretation_chart")
 
     response = st.text_area(f"{selected_property}의 경향성을 서술해보세요:", key="interpretation_response")
     if st.button("응답 제출", key="analysis"):
@@ -315,10 +321,10 @@ def additional_activities_page():
     st.write("여기서 원하는 속성을 선택하여 X축, Y축을 지정하거나 히트맵으로 상관관계를 확인할 수 있습니다.")
 
     # 모든 속성(유효 핵전하, 전자배치, 원자가 전자수 포함) 사용 가능
-    numeric_cols = ['Atomic_Number', 'Atomic_Mass', 'Atomic_Radius', 'Ionization_Energy', 'Electronegativity', 'Effective_Nuclear_Charge', 'Number_of_Electrons']
+    numeric_cols = ['Atomic_Number', 'Atomic_Mass', 'Atomic_Radius', 'Ionization_Energy', 'Electronegativity', 'Effective_Nuclear_Charge', 'Subshell_Zeff', 'Number_of_Electrons']
     # 전자배치는 문자열이므로 수치형 그래프에서는 제외. 하지만 상관관계에서는 제외.
     # 그래프용 셀렉션 (수치형)
-    available_for_xy = {c: all_properties[c] for c in all_properties if c in ['Atomic_Number','Atomic_Mass','Atomic_Radius','Ionization_Energy','Electronegativity','Effective_Nuclear_Charge','Number_of_Electrons']}
+    available_for_xy = {c: all_properties[c] for c in all_properties if c in numeric_cols}
 
     x_axis_label_add = st.selectbox("X축 데이터 선택", list(available_for_xy.values()), key="x_axis_add")
     y_axis_label_add = st.selectbox("Y축 데이터 선택", list(available_for_xy.values()), key="y_axis_add")
@@ -358,7 +364,7 @@ def additional_activities_page():
             hover_data=['Element', 'Symbol']
         )
 
-    st.plotly_chart(fig_add)
+    st.plotly_chart(fig_add, key="additional_chart")
 
     # 히트맵
     st.subheader("히트맵으로 상관관계 확인하기")
@@ -403,6 +409,9 @@ def main():
         if st.session_state.user_type == "교사":
             teacher_dashboard()
         elif st.session_state.user_type == "학생":
+            # 선택한 부껍질의 유효 핵전하를 모든 그래프에서 쓸 수 있는 열로 추가
+            subshell = st.sidebar.selectbox("유효 핵전하를 볼 부껍질", SUBSHELLS, index=SUBSHELLS.index("2p"), key="zeff_subshell")
+            df['Subshell_Zeff'] = load_subshell_zeff()[subshell]
             tabs = st.tabs(["문제 인식 단계", "시각화 단계", "해석 단계", "추가 활동"])
             with tabs[0]:
                 problem_recognition_page()
@@ -2,10 +2,12 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 
-st.set_page_config(layout="wide")
+from buffer_grid import load_grid, lookup_pH
+from buffer_model import (ACETIC_ACID, BUFFER_SYSTEMS, MAX_ADDED, additives, buffer_capacity, capacity_map, fractions,
+                          speciation, speciation_curve, titrate, titration_curve, total_acid)
+from buffer_view import IonModelRenderer
 
-# 헨더슨-하셀바흐 식: pH = pKa + log([A-]/[HA])
-pKa = 4.76
+st.set_page_config(layout="wide")
 
 st.title("완충용액 공통 이온 효과 시뮬레이션")
 
@@ -25,6 +27,11 @@ st.sidebar.header("초기 조건 및 추가물질 설정")
 
 col_init = st.sidebar.expander("초기 농도 설정", expanded=True)
 with col_init:
+    # 완충 체계: 산의 pKa 목록과 HA / A⁻로 쓰는 짝산-짝염기 쌍 (buffer_model.BUFFER_SYSTEMS)
+    buffer_system = st.selectbox("완충 체계", list(BUFFER_SYSTEMS))
+    pKas, pair, species_names, _ = BUFFER_SYSTEMS[buffer_system]
+    HA_name, A_name = species_names[pair], species_names[pair + 1]
+
     initial_HA_slider = st.slider("초기 HA 농도 (mM)", min_value=1.0, max_value=100.0, value=50.0)
     initial_HA_input = st.number_input("직접 입력 (초기 HA, mM)", value=initial_HA_slider, min_value=1.0, max_value=100.0)
     initial_HA = initial_HA_input
@@ -35,121 +42,124 @@ with col_init:
 
 col_add = st.sidebar.expander("물질 추가", expanded=True)
 with col_add:
-    add_species = st.selectbox("추가할 물질 선택", ["None", "강산(HCl)", "강염기(NaOH)", "아세트산나트륨(NaA)"])
-    added_amount_slider = st.slider("추가량 (mM)", min_value=0.0, max_value=100.0, value=0.0, step=1.0)
-    added_amount_input = st.number_input("직접 입력 (추가량, mM)", value=added_amount_slider, min_value=0.0, max_value=100.0, step=1.0)
+    add_species = st.selectbox("추가할 물질 선택", list(additives(buffer_system)))
+    added_amount_slider = st.slider("추가량 (mM)", min_value=0.0, max_value=MAX_ADDED, value=0.0, step=1.0)
+    added_amount_input = st.number_input("직접 입력 (추가량, mM)", value=added_amount_slider, min_value=0.0, max_value=MAX_ADDED, step=1.0)
     added_amount = added_amount_input
 
-# 초기 상태
-HA = initial_HA
-A = initial_A
-
-# 강산(HCl) 추가
-if add_species == "강산(HCl)" and added_amount > 0:
-    delta = min(A, added_amount)
-    A = A - delta
-    HA = HA + delta
-    leftover_H = added_amount - delta
-    if leftover_H > 0:
-        HA += leftover_H
-
-# 강염기(NaOH) 추가
-if add_species == "강염기(NaOH)" and added_amount > 0:
-    delta = min(HA, added_amount)
-    HA = HA - delta
-    A = A + delta
-    leftover_OH = added_amount - delta
-
-# 아세트산나트륨(NaA) 추가
-if add_species == "아세트산나트륨(NaA)" and added_amount > 0:
-    A = A + added_amount
-
-# pH 계산 로직
-if add_species == "강염기(NaOH)" and added_amount > 0:
-    delta = min(initial_HA, added_amount)
-    leftover_OH = added_amount - delta
-    if leftover_OH > 0:
-        OH_conc = leftover_OH * 1e-3
-        pOH = -np.log10(OH_conc)
-        pH = 14 - pOH
-    else:
-        if A > 0 and HA > 0:
-            pH = pKa + np.log10(A/HA)
-        else:
-            if A <= 0:
-                pH = 0
-            elif HA <= 0:
-                pH = 14
+# 미리 계산해 디스크에 저장한 pH 표 (buffer_grid), 추가 물질마다 한 번만 읽는다
+@st.cache_resource
+def cached_pH_grid(additive):
+    return load_grid(additive)
+
+# 최종 평형 상태와 pH: 전하 균형식을 정확히 풀어 계산한다 (buffer_model.titrate). 완충 영역에서는
+# 헨더슨-하셀바흐 식 pH = pKa + log([A-]/[HA])와 거의 같다.
+# 아세트산은 미리 계산한 표를 보간해 바로 읽는다 (정확한 계산과의 차이는 buffer_grid.ERROR_BOUND 이하)
+additive = additives(buffer_system)[add_species]
+if buffer_system == ACETIC_ACID:
+    grid_additive = additive or "NaA"  # 아무것도 넣지 않은 경우 = NaA 0 mM
+    pH = lookup_pH(cached_pH_grid(grid_additive), initial_HA, initial_A, grid_additive, added_amount if additive else 0.0)
 else:
-    if add_species == "강산(HCl)" and added_amount > 0:
-        leftover_H = added_amount - min(initial_A, added_amount)
-        if leftover_H > 0:
-            H_conc = leftover_H * 1e-3
-            pH = -np.log10(H_conc)
-        else:
-            if A > 0 and HA > 0:
-                pH = pKa + np.log10(A/HA)
-            else:
-                if A <= 0:
-                    pH = 0
-                elif HA <= 0:
-                    pH = 14
-    else:
-        if A > 0 and HA > 0:
-            pH = pKa + np.log10(A/HA)
-        else:
-            if A <= 0:
-                pH = 0
-            elif HA <= 0:
-                pH = 14
+    pH = float(titrate(initial_HA, initial_A, additive, added_amount, pKas, pair)[0])
+acid_total = total_acid(initial_HA, initial_A, additive, added_amount)
+HA, A = (float(value) for value in speciation(acid_total, pH, pKas, pair))
+pKa = pKas[pair]
+
+# 전체 적정 곡선: 초기 농도와 추가 물질이 같으면 다시 계산하지 않는다
+@st.cache_data
+def cached_titration_curve(initial_HA, initial_A, additive, pKas, pair):
+    return titration_curve(initial_HA, initial_A, additive, pKas=pKas, pair=pair)
+
+# 완충 용량 지도: 초기 [HA] x [A⁻] 격자 전체를 한 번에 계산하고, 모든 세션이 함께 쓴다
+CAPACITY_CONCENTRATIONS = np.linspace(1.0, 100.0, 100)
+
+@st.cache_data
+def cached_capacity_map(pKas, pair):
+    return capacity_map(pKas, pair, CAPACITY_CONCENTRATIONS)
+
+# 종 분포 곡선 (pH에 따른 α₀…αₙ), 완충 체계마다 한 번만 계산한다
+@st.cache_data
+def cached_speciation_curve(pKas):
+    return speciation_curve(pKas)
 
 # 결과 표시
 st.subheader("결과")
 col1, col2 = st.columns(2)
 with col1:
     st.write(f"**최종 pH**: {pH:.2f}")
-    st.write(f"**최종 HA 농도**: {HA:.2f} mM")
-    st.write(f"**최종 A⁻ 농도**: {A:.2f} mM")
+    st.write(f"**최종 HA ({HA_name}) 농도**: {HA:.2f} mM")
+    st.write(f"**최종 A⁻ ({A_name}) 농도**: {A:.2f} mM")
 
 # 농도 막대 그래프
 with col2:
     fig, ax = plt.subplots(figsize=(4,3))
-    ions = ["HA", "A⁻"]
+    ions = [HA_name, A_name]
     concs = [HA, A]
     ax.bar(ions, concs, color=["red", "blue"])
     ax.set_ylabel("농도 (mM)")
     ax.set_title("HA와 A⁻ 농도 변화")
     st.pyplot(fig)
 
+# 적정 곡선: 추가량 전 범위의 pH, 현재 추가량은 강조 표시
+if additive is not None:
+    added, curve_pH, _, _ = cached_titration_curve(initial_HA, initial_A, additive, pKas, pair)
+    st.subheader("적정 곡선")
+    fig3, ax3 = plt.subplots(figsize=(8,3))
+    ax3.plot(added, curve_pH, color="purple")
+    ax3.axhspan(pKa - 1, pKa + 1, color="gray", alpha=0.15, label="완충 영역 (pKa ± 1)")
+    ax3.scatter([added_amount], [pH], color="black", zorder=3, label="현재 상태")
+    ax3.set_xlabel(f"{add_species} 추가량 (mM)")
+    ax3.set_ylabel("pH")
+    ax3.set_xlim(0, MAX_ADDED)
+    ax3.set_ylim(0, 14)
+    ax3.legend()
+    st.pyplot(fig3)
+
+# 완충 용량 β = dC/dpH: pH를 1 바꾸는 데 필요한 강산(강염기)의 양. 클수록 pH가 잘 변하지 않는다
+st.subheader("완충 용량 지도 (초기 농도별 β)")
+_, capacity = cached_capacity_map(pKas, pair)
+initial_capacity = 1e3 * float(buffer_capacity(
+    titrate(initial_HA, initial_A, None, 0.0, pKas, pair)[0], (initial_HA + initial_A) * 1e-3, pKas))
+fig5, ax5 = plt.subplots(figsize=(5,4))
+mesh = ax5.pcolormesh(CAPACITY_CONCENTRATIONS, CAPACITY_CONCENTRATIONS, capacity, cmap="viridis", shading="auto")
+fig5.colorbar(mesh, ax=ax5, label="β (mM / pH)")
+ax5.scatter([initial_A], [initial_HA], color="red", edgecolors="white", s=80, zorder=3, label="현재 초기 조건")
+ax5.set_xlabel(f"초기 A⁻ ({A_name}) 농도 (mM)")
+ax5.set_ylabel(f"초기 HA ({HA_name}) 농도 (mM)")
+ax5.legend(loc="upper left")
+st.pyplot(fig5)
+st.write(f"**현재 초기 조건의 완충 용량**: {initial_capacity:.1f} mM / pH")
+
+# 종 분포: pH에 따른 각 화학종의 비율과 현재 pH
+st.subheader("종 분포 (pH에 따른 화학종 비율)")
+curve_pH, curve_fractions = cached_speciation_curve(pKas)
+fig4, ax4 = plt.subplots(figsize=(8,3))
+for index, name in enumerate(species_names):
+    ax4.plot(curve_pH, curve_fractions[:, index], label=name)
+ax4.axvline(pH, color="black", linestyle="--", label=f"현재 pH {pH:.2f}")
+ax4.set_xlabel("pH")
+ax4.set_ylabel("비율 α")
+ax4.set_xlim(0, 14)
+ax4.set_ylim(0, 1)
+ax4.legend(loc="center right")
+st.pyplot(fig4)
+st.write("  ".join(f"**{name}**: {acid_total * fraction:.2f} mM"
+                   for name, fraction in zip(species_names, fractions(pH, pKas))))
+
 st.write("---")
 
 # 이온 모형 표시
 st.subheader("이온 모형 (상대적 개수 표현)")
 
 # 이온 개수를 시각적으로 표현하기 위해 농도에 비례한 개수의 점을 찍는다.
-max_points = 100
-HA_points = int(min(max_points, HA))
-A_points = int(min(max_points, A))
-
-# HA 이온 위치 (랜덤)
-np.random.seed(42)
-HA_x = np.random.rand(HA_points) * 0.5  # 0~0.5 구간
-HA_y = np.random.rand(HA_points)
-
-# A 이온 위치 (랜덤, 다른 영역)
-A_x = 0.5 + np.random.rand(A_points) * 0.5  # 0.5~1 구간
-A_y = np.random.rand(A_points)
-
-fig2, ax2 = plt.subplots(figsize=(6,3))
-ax2.scatter(HA_x, HA_y, c='red', alpha=0.6, label='HA')
-ax2.scatter(A_x, A_y, c='blue', alpha=0.6, label='A⁻')
-ax2.set_xticks([])
-ax2.set_yticks([])
-ax2.set_xlim(0,1)
-ax2.set_ylim(0,1)
-ax2.set_title("이온 모형 (점의 개수 ~ 농도)")
-ax2.legend()
-st.pyplot(fig2)
+# 점 위치는 고정된 풀에서 가져오므로 농도가 바뀌면 점이 더해지거나 빠질 뿐이고,
+# 같은 (HA 점 수, A⁻ 점 수) 그림은 다시 그리지 않는다.
+@st.cache_resource
+def ion_model_renderer():
+    return IonModelRenderer()
+
+renderer = ion_model_renderer()
+st.image(renderer.png(renderer.points(HA), renderer.points(A)))
 
 st.write("""
 **해석**:  
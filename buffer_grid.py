@@ -0,0 +1,191 @@
+import argparse
+import math
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from disk_cache import atomic_write, params_hash
+from buffer_model import KW, MAX_ADDED, PKA, titrate
+
+# Precomputed pH tables live here, one file per additive and grid layout
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".buffer_cache")
+
+# Bump when the pH model changes, so stale tables are rebuilt
+GRID_VERSION = 1
+
+# Range of the initial [HA] and [A⁻] sliders (mM)
+MIN_CONCENTRATION, MAX_CONCENTRATION = 1.0, 100.0
+
+# Nodes along each initial-concentration axis (log-spaced) and along the progress axis
+CONCENTRATION_NODES = 32
+PROGRESS_NODES = 401
+
+# Scale (mM) of the asinh spacing of the progress axis: nodes are about this close
+# together at the start of the titration and around the equivalence point
+PROGRESS_SCALE = 1e-3
+
+# Largest added amount (mM) tabulated; beyond MAX_ADDED so the edge interpolates cleanly
+ADDED_LIMIT = 2 * MAX_ADDED
+
+# Worst pH error of the default grid against titrate, measured by `python buffer_grid.py`
+# over random states in the full slider range; lookups are good to about this much
+ERROR_BOUND = 0.005
+
+# Signed excess (mM) of the additive over what the buffer can absorb; the
+# equivalence point is always at 0
+def _excess(initial_HA, initial_A, additive, added):
+    if additive == "HCl":
+        return added - initial_A
+    if additive == "NaOH":
+        return added - initial_HA
+    return added  # NaA (or nothing) never passes an equivalence point
+
+# Position along the titration: grows with the added amount and changes fastest
+# where pH does, right after the first drop and around the equivalence point, so
+# linear interpolation along it never smears a steep stretch across grid cells
+def _progress(initial_HA, initial_A, additive, added):
+    return (np.arcsinh(_excess(initial_HA, initial_A, additive, added) / PROGRESS_SCALE)
+            + np.arcsinh(added / PROGRESS_SCALE))
+
+# Added amount at the given progress, by bisection (in asinh units, so it resolves
+# amounts down to PROGRESS_SCALE); clamped to [0, ADDED_LIMIT]
+def _added(initial_HA, initial_A, additive, progress, iterations=60):
+    lo = np.zeros(np.shape(progress))
+    hi = np.full(np.shape(progress), np.arcsinh(ADDED_LIMIT / PROGRESS_SCALE))
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        below = _progress(initial_HA, initial_A, additive, PROGRESS_SCALE * np.sinh(mid)) < progress
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return PROGRESS_SCALE * np.sinh((lo + hi) / 2)
+
+# Grid coordinates of each axis: log concentration and progress
+@lru_cache(maxsize=None)
+def _axes(concentration_nodes, progress_nodes):
+    log_concentrations = np.linspace(np.log(MIN_CONCENTRATION), np.log(MAX_CONCENTRATION), concentration_nodes)
+    lowest = np.arcsinh(-MAX_CONCENTRATION / PROGRESS_SCALE)
+    highest = 2 * np.arcsinh(ADDED_LIMIT / PROGRESS_SCALE)
+    return log_concentrations, np.linspace(lowest, highest, progress_nodes)
+
+# pH table of one additive over initial [HA] x initial [A⁻] x progress. Nodes that
+# no slider position reaches are clamped to the nearest reachable added amount.
+def build_grid(additive, concentration_nodes=CONCENTRATION_NODES, progress_nodes=PROGRESS_NODES):
+    log_concentrations, progress_axis = _axes(concentration_nodes, progress_nodes)
+    concentrations = np.exp(log_concentrations)
+    HA0, A0, progress = np.meshgrid(concentrations, concentrations, progress_axis, indexing="ij")
+    pH, _, _ = titrate(HA0, A0, additive, _added(HA0, A0, additive, progress))
+    return pH.astype(np.float32)
+
+def grid_path(additive, concentration_nodes=CONCENTRATION_NODES, progress_nodes=PROGRESS_NODES):
+    key = params_hash(dict(additive=additive, pKa=PKA, kw=KW, concentration_nodes=concentration_nodes,
+                           progress_nodes=progress_nodes, progress_scale=PROGRESS_SCALE, added_limit=ADDED_LIMIT,
+                           version=GRID_VERSION))
+    return os.path.join(CACHE_DIR, f"ph_{additive}_{key}.npy")
+
+# pH table of one additive, read from disk or built and saved on first use
+def load_grid(additive, concentration_nodes=CONCENTRATION_NODES, progress_nodes=PROGRESS_NODES):
+    path = grid_path(additive, concentration_nodes, progress_nodes)
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+    grid = build_grid(additive, concentration_nodes, progress_nodes)
+    atomic_write(path, lambda partial: np.save(partial, grid), ".npy")
+    return grid
+
+# Fractional grid position of each state along one axis, clamped to the grid
+def _position(value, axis):
+    position = np.clip((value - axis[0]) / (axis[1] - axis[0]), 0, len(axis) - 1 - 1e-9)
+    index = np.floor(position).astype(int)
+    return index, position - index
+
+# One state with plain floats: the slider readout, a few microseconds per call
+def _lookup_one(grid, initial_HA, initial_A, additive, added):
+    log_concentrations, progress_axis = _axes(grid.shape[0], grid.shape[2])
+    initial_HA = min(max(initial_HA, MIN_CONCENTRATION), MAX_CONCENTRATION)
+    initial_A = min(max(initial_A, MIN_CONCENTRATION), MAX_CONCENTRATION)
+    added = min(max(added, 0.0), ADDED_LIMIT)
+    excess = _excess(initial_HA, initial_A, additive, added)
+    coordinates = (
+        math.log(initial_HA),
+        math.log(initial_A),
+        math.asinh(excess / PROGRESS_SCALE) + math.asinh(added / PROGRESS_SCALE),
+    )
+    lower, weight = [], []
+    for value, axis in zip(coordinates, (log_concentrations, log_concentrations, progress_axis)):
+        start, spacing = float(axis[0]), float(axis[1] - axis[0])
+        position = min(max((value - start) / spacing, 0.0), len(axis) - 1 - 1e-9)
+        lower.append(int(position))
+        weight.append(position - int(position))
+
+    (i, j, k), (wi, wj, wk) = lower, weight
+    cube = grid[i:i + 2, j:j + 2, k:k + 2].tolist()
+    pH = 0.0
+    for di, fi in ((0, 1 - wi), (1, wi)):
+        for dj, fj in ((0, 1 - wj), (1, wj)):
+            for dk, fk in ((0, 1 - wk), (1, wk)):
+                pH += cube[di][dj][dk] * fi * fj * fk
+    return pH
+
+# Trilinear interpolation of a pH table at the given states (scalars or arrays),
+# clamped to the grid. Same arguments and units as buffer_model.titrate.
+def lookup_pH(grid, initial_HA, initial_A, additive, added):
+    if np.ndim(initial_HA) == np.ndim(initial_A) == np.ndim(added) == 0:
+        return _lookup_one(grid, float(initial_HA), float(initial_A), additive, float(added))
+
+    log_concentrations, progress_axis = _axes(grid.shape[0], grid.shape[2])
+    initial_HA = np.clip(initial_HA, MIN_CONCENTRATION, MAX_CONCENTRATION)
+    initial_A = np.clip(initial_A, MIN_CONCENTRATION, MAX_CONCENTRATION)
+    (i, wi), (j, wj), (k, wk) = (
+        _position(np.log(initial_HA), log_concentrations),
+        _position(np.log(initial_A), log_concentrations),
+        _position(_progress(initial_HA, initial_A, additive, np.clip(added, 0.0, ADDED_LIMIT)), progress_axis),
+    )
+    i, j, k = np.broadcast_arrays(i, j, k)
+    pH = 0.0
+    for di in (0, 1):
+        for dj in (0, 1):
+            for dk in (0, 1):
+                corner = grid[i + di, j + dj, k + dk]
+                pH = pH + corner * (wi if di else 1 - wi) * (wj if dj else 1 - wj) * (wk if dk else 1 - wk)
+    return pH
+
+# Largest |lookup_pH - titrate| over random states in the slider range
+def max_error(grid, additive, samples=200_000, seed=0):
+    rng = np.random.default_rng(seed)
+    initial_HA, initial_A = rng.uniform(MIN_CONCENTRATION, MAX_CONCENTRATION, (2, samples))
+    added = rng.uniform(0.0, MAX_ADDED, samples)
+    exact, _, _ = titrate(initial_HA, initial_A, additive, added)
+    return float(np.abs(lookup_pH(grid, initial_HA, initial_A, additive, added) - exact).max())
+
+# Build (or load) every table and report its size, lookup time and worst error;
+# exits with status 1 when any table is worse than ERROR_BOUND, e.g.
+#   python buffer_grid.py
+#   python buffer_grid.py --concentration-nodes 64 --progress-nodes 801
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the buffer pH tables and check their accuracy")
+    parser.add_argument("--concentration-nodes", type=int, default=CONCENTRATION_NODES)
+    parser.add_argument("--progress-nodes", type=int, default=PROGRESS_NODES)
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    exceeded = False
+    for additive in ("HCl", "NaOH", "NaA"):
+        start = time.perf_counter()
+        grid = load_grid(additive, args.concentration_nodes, args.progress_nodes)
+        loaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            lookup_pH(grid, 42.5, 17.25, additive, 30.0)
+        per_lookup = (time.perf_counter() - start) / 1000
+
+        error = max_error(grid, additive, args.samples)
+        print(f"{additive:5s} {grid.nbytes / 1e6:6.1f} MB  load/build {loaded:6.2f} s  "
+              f"lookup {per_lookup * 1e6:6.1f} µs  max error {error:.4f} pH"
+              + ("" if error <= ERROR_BOUND else f"  (above ERROR_BOUND {ERROR_BOUND})"))
+        exceeded |= error > ERROR_BOUND
+    # A non-zero exit lets scripts and CI catch a grid that no longer meets ERROR_BOUND
+    raise SystemExit(1 if exceeded else 0)
@@ -0,0 +1,160 @@
+import numpy as np
+
+# Acetic acid
+PKA = 4.76
+
+# Buffer systems of the simulator, by the label shown in its selectbox:
+# pKa values of the acid, the index k of the conjugate pair the initial [HA] / [A⁻]
+# inputs refer to (HA has given up k protons, A⁻ k + 1), the name of every species
+# from fully protonated to fully deprotonated, and the sodium salt of A⁻.
+# The HA form is added as its sodium salt too when k > 0 (e.g. NaH₂PO₄).
+BUFFER_SYSTEMS = {
+    "아세트산 (CH₃COOH / CH₃COO⁻)": ((PKA,), 0, ("CH₃COOH", "CH₃COO⁻"), "아세트산나트륨(NaA)"),
+    "인산 (H₂PO₄⁻ / HPO₄²⁻)": ((2.15, 7.20, 12.35), 1, ("H₃PO₄", "H₂PO₄⁻", "HPO₄²⁻", "PO₄³⁻"),
+                               "인산수소이나트륨(Na₂HPO₄)"),
+    "탄산 (H₂CO₃ / HCO₃⁻)": ((6.35, 10.33), 0, ("H₂CO₃", "HCO₃⁻", "CO₃²⁻"), "탄산수소나트륨(NaHCO₃)"),
+}
+ACETIC_ACID = "아세트산 (CH₃COOH / CH₃COO⁻)"
+
+# Additives of one buffer system, by the label shown in the simulator's selectbox
+def additives(system=ACETIC_ACID):
+    return {"None": None, "강산(HCl)": "HCl", "강염기(NaOH)": "NaOH", BUFFER_SYSTEMS[system][3]: "NaA"}
+
+ADDITIVES = additives()
+
+# Largest added amount (mM) the simulator offers
+MAX_ADDED = 100.0
+
+# Ion product of water at 25 °C
+KW = 1e-14
+
+# Fractions α₀…αₙ of a polyprotic acid with the given pKa values at each pH, from
+# fully protonated (α₀) to fully deprotonated (αₙ), stacked along a new last axis:
+#   αᵢ ∝ [H⁺]ⁿ⁻ⁱ · Ka₁ ⋯ Kaᵢ
+# Computed in log space, so very acidic or basic pH cannot overflow.
+def fractions(pH, pKas=(PKA,)):
+    pH = np.asarray(pH, dtype=float)[..., np.newaxis]
+    pKas = np.atleast_1d(np.asarray(pKas, dtype=float))
+    n = len(pKas)
+    protons = np.arange(n, -1, -1)  # protons still bound in species i
+    log_terms = -protons * pH - np.concatenate([[0.0], np.cumsum(pKas)])
+    log_terms -= log_terms.max(axis=-1, keepdims=True)
+    terms = 10.0 ** log_terms
+    return terms / terms.sum(axis=-1, keepdims=True)
+
+# Mean and variance of the number of protons an acid has given up at each pH. The
+# mean times the total is the acid's negative charge; the variance is how fast that
+# charge changes with ln[H⁺], which sets both the solver's slope and the buffer capacity.
+def _charge_moments(pH, pKas):
+    alpha = fractions(pH, pKas)
+    charge = np.arange(alpha.shape[-1])
+    mean = alpha @ charge
+    return mean, alpha @ charge ** 2 - mean ** 2
+
+# [H⁺] (mol/L) that satisfies the charge balance of a mixture of weak acids plus
+# spectator Na⁺ and Cl⁻. `acids` is a list of (total concentration, pKa values)
+# pairs; all concentrations are mol/L, scalars or arrays:
+#   [H⁺] + [Na⁺] = [OH⁻] + [Cl⁻] + Σ total · Σᵢ i·αᵢ,  [OH⁻] = Kw/[H⁺]
+# The left minus the right side grows strictly with [H⁺], so the root is unique and
+# bracketed. Newton steps in ln[H⁺] converge in a handful of iterations (the
+# slope of an acid's mean charge is the variance of its deprotonation state); a
+# step that leaves the bracket falls back to bisection. Every state is solved at once.
+def solve_mixture(acids, sodium, chloride, kw=KW, tol=1e-12, max_iter=100):
+    totals = [np.asarray(total, dtype=float) for total, _ in acids]
+    sodium, chloride, *totals = np.broadcast_arrays(
+        np.asarray(sodium, dtype=float), np.asarray(chloride, dtype=float), *totals)
+    pKas = [np.atleast_1d(pKa) for _, pKa in acids]
+    # f < 0 at lo and f > 0 at hi, see the balance above
+    lo = np.log(kw / (sodium + 1e-6))
+    hi = np.log(chloride + sum(total * len(pKa) for total, pKa in zip(totals, pKas)) + 1e-6)
+    u = (lo + hi) / 2
+
+    for _ in range(max_iter):
+        h = np.exp(u)
+        f = h + sodium - kw / h - chloride
+        # d f / d ln h
+        slope = h + kw / h
+        for total, pKa in zip(totals, pKas):
+            mean, variance = _charge_moments(-u / np.log(10), pKa)
+            f = f - total * mean
+            slope = slope + total * variance
+        lo = np.where(f < 0, u, lo)
+        hi = np.where(f > 0, u, hi)
+        step = u - f / slope
+        step = np.where((step > lo) & (step < hi), step, (lo + hi) / 2)
+        converged = np.abs(step - u) < tol
+        u = step
+        if converged.all():
+            break
+    return np.exp(u)
+
+# [H⁺] (mol/L) of a single weak acid with acid_total = [HA] + [A⁻] (one or more
+# pKa values) plus spectator Na⁺ and Cl⁻, see solve_mixture
+def solve_hydrogen(acid_total, sodium, chloride, pKa=PKA, kw=KW, tol=1e-12, max_iter=100):
+    return solve_mixture([(acid_total, pKa)], sodium, chloride, kw, tol, max_iter)
+
+# Final [HA], [A⁻] (mM) and pH after adding `added` mM of `additive` ("HCl", "NaOH",
+# "NaA" or None) to a buffer of initial_HA mM HA and initial_A mM of the sodium salt
+# of A⁻. pKas and pair pick the acid and its conjugate pair (acetic acid by
+# default, see BUFFER_SYSTEMS). All amounts may be scalars or arrays (broadcast
+# together), so a whole titration curve or grid is one NumPy pass. The pH comes
+# from the exact charge balance, including water autoionization, so it stays
+# correct at equivalence and beyond the buffer region.
+def titrate(initial_HA, initial_A, additive, added, pKas=(PKA,), pair=0):
+    acid_total, sodium, chloride = _totals(initial_HA, initial_A, additive, added, pair)
+    h = solve_hydrogen(acid_total * 1e-3, sodium * 1e-3, chloride * 1e-3, pKas)
+    pH = -np.log10(h)
+    return (pH, *speciation(acid_total, pH, pKas, pair))
+
+# Total acid, Na⁺ and Cl⁻ (mM) of the mixture
+def _totals(initial_HA, initial_A, additive, added, pair=0):
+    initial_HA, initial_A, added = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (initial_HA, initial_A, added)))
+    acid_total = initial_HA + initial_A
+    sodium = pair * initial_HA + (pair + 1) * initial_A
+    chloride = np.zeros(added.shape)
+
+    if additive == "HCl":
+        chloride = chloride + added
+    elif additive == "NaOH":
+        sodium = sodium + added
+    elif additive == "NaA":
+        sodium = sodium + (pair + 1) * added
+        acid_total = acid_total + added
+    return acid_total, sodium, chloride
+
+# [HA] and [A⁻] of the conjugate pair `pair` (same units as acid_total) at the given pH
+def speciation(acid_total, pH, pKas=(PKA,), pair=0):
+    alpha = fractions(pH, pKas)
+    return acid_total * alpha[..., pair], acid_total * alpha[..., pair + 1]
+
+# Total acid, all forms together (mM), after adding `added` mM of `additive`
+def total_acid(initial_HA, initial_A, additive, added):
+    return initial_HA + initial_A + (added if additive == "NaA" else 0.0)
+
+# Whole titration curve for one additive: added amounts from 0 to max_added mM and
+# the pH, [HA] and [A⁻] at each of them
+def titration_curve(initial_HA, initial_A, additive, max_added=MAX_ADDED, points=401, pKas=(PKA,), pair=0):
+    added = np.linspace(0.0, max_added, points)
+    return (added, *titrate(initial_HA, initial_A, additive, added, pKas, pair))
+
+# Buffer capacity β = dC_base/dpH (mol/L per pH unit) of a solution at the given pH
+# with acid_total (mol/L) of an acid with the given pKa values: strong base needed
+# per unit pH rise, the same as strong acid per unit pH drop. Closed form:
+#   β = ln 10 · ([H⁺] + [OH⁻] + acid_total · Var(protons given up))
+def buffer_capacity(pH, acid_total, pKas=(PKA,), kw=KW):
+    h = 10.0 ** -np.asarray(pH, dtype=float)
+    _, variance = _charge_moments(pH, pKas)
+    return np.log(10) * (h + kw / h + acid_total * variance)
+
+# pH and buffer capacity (mM per pH unit) of every starting mix on a grid of initial
+# [HA] (rows) x initial [A⁻] (columns), both in mM, solved in one vectorized pass
+def capacity_map(pKas=(PKA,), pair=0, concentrations=np.linspace(1.0, 100.0, 100)):
+    initial_HA, initial_A = np.meshgrid(concentrations, concentrations, indexing="ij")
+    pH, _, _ = titrate(initial_HA, initial_A, None, 0.0, pKas, pair)
+    return pH, 1e3 * buffer_capacity(pH, (initial_HA + initial_A) * 1e-3, pKas)
+
+# Species fractions of an acid over a pH range, for speciation plots
+def speciation_curve(pKas, pH_min=0.0, pH_max=14.0, points=561):
+    pH = np.linspace(pH_min, pH_max, points)
+    return pH, fractions(pH, pKas)
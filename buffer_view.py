@@ -0,0 +1,56 @@
+import io
+import threading
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.figure import Figure
+
+# Most points drawn per species in the ion model
+MAX_POINTS = 100
+
+# Rendered pictures kept per renderer; there are at most (MAX_POINTS + 1)² states
+MAX_CACHED_IMAGES = 1024
+
+# Ion model of buffer.py: HA as red points in the left half, A⁻ as blue points in the
+# right half, their number proportional to the concentration. Every position comes
+# from a fixed pool drawn once, and n points are always the first n of the pool, so
+# a change in concentration only adds or removes points instead of reshuffling the
+# picture. One figure is kept and only its offsets change, and the PNG of each
+# (HA_points, A_points) state is memoized, so revisiting a state costs nothing.
+class IonModelRenderer:
+    def __init__(self, max_points=MAX_POINTS, seed=42, figsize=(6, 3)):
+        rng = np.random.default_rng(seed)
+        self.HA_pool = rng.random((max_points, 2)) * [0.5, 1.0]  # 0~0.5 구간
+        self.A_pool = rng.random((max_points, 2)) * [0.5, 1.0] + [0.5, 0.0]  # 0.5~1 구간
+        self.max_points = max_points
+
+        # A bare Figure (not pyplot) is never registered globally, so nothing leaks
+        self.fig = Figure(figsize=figsize)
+        self.ax = self.fig.subplots()
+        empty = np.empty((0, 2))
+        self.HA = self.ax.scatter(empty[:, 0], empty[:, 1], c='red', alpha=0.6, label='HA')
+        self.A = self.ax.scatter(empty[:, 0], empty[:, 1], c='blue', alpha=0.6, label='A⁻')
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+        self.ax.set_title("이온 모형 (점의 개수 ~ 농도)")
+        self.ax.legend(loc="upper right")
+
+        # Streamlit reruns may share one renderer across threads
+        self._lock = threading.Lock()
+        self.png = lru_cache(maxsize=MAX_CACHED_IMAGES)(self._render)
+
+    # Number of points shown for a concentration (mM)
+    def points(self, concentration):
+        return int(min(self.max_points, max(concentration, 0)))
+
+    # PNG bytes of the picture with the given numbers of points (memoized as self.png)
+    def _render(self, HA_points, A_points):
+        with self._lock:
+            self.HA.set_offsets(self.HA_pool[:HA_points])
+            self.A.set_offsets(self.A_pool[:A_points])
+            image = io.BytesIO()
+            # Same output settings as st.pyplot, so the picture looks as before
+            self.fig.savefig(image, format="png", dpi=200, bbox_inches="tight")
+            return image.getvalue()
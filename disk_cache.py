@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# Shared pieces of the on-disk caches (neutralization trajectories and exports,
+# buffer pH tables, element tables): every entry is named by a hash of what it
+# depends on, and written under a temporary name first so a half-written entry is
+# never read back.
+
+# Short hash of a parameter dict (key order does not matter)
+def params_hash(params, length=16):
+    key = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()[:length]
+
+# Short hash of the contents of some files plus a salt (e.g. a format version)
+def files_hash(paths, salt="", length=16):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as data:
+            digest.update(data.read())
+    digest.update(salt.encode())
+    return digest.hexdigest()[:length]
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+# Create the cache entry `path` with write(partial), then move it into place.
+# partial is a fresh temporary name in the same directory, unique to this call (so
+# concurrent writers in other threads or processes never share one), ending in
+# `suffix` for writers that pick the format from the extension. With
+# directory=True partial is an empty directory for write to fill, otherwise a file
+# write may overwrite. If another writer finished the same directory entry first,
+# its copy is kept.
+def atomic_write(path, write, suffix="", directory=False):
+    parent, name = os.path.split(path)
+    os.makedirs(parent, exist_ok=True)
+    if directory:
+        partial = tempfile.mkdtemp(suffix=".partial", prefix=name + ".", dir=parent)
+    else:
+        handle, partial = tempfile.mkstemp(suffix=".partial" + suffix, prefix=name + ".", dir=parent)
+        os.close(handle)
+    try:
+        write(partial)
+        os.replace(partial, path)
+    except OSError:
+        _remove(partial)
+        if not os.path.exists(path):
+            raise
+    except BaseException:
+        _remove(partial)
+        raise
+    return path
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from disk_cache import atomic_write, files_hash
+
+# Raw element table shipped with the repo (118 elements)
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "elementdatavalues.csv")
+
+# Parsed tables live here, one directory per source file content
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".element_cache")
+
+# Bump when the parsing below changes, so stale caches are rebuilt
+CACHE_VERSION = 1
+
+# Text columns with at most this share of distinct values become categoricals
+# (Phase, Block, Color, ...); the rest (Name, CAS_Number, ...) stay strings
+CATEGORY_SHARE = 0.25
+
+# Ratios written as text, e.g. Adiabatic_Index "7/5"
+FRACTION = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*/\s*(\d+(?:\.\d*)?)\s*$")
+
+# Value of a "7/5"-style ratio, or None when the text is not one
+def _fraction(text):
+    match = FRACTION.match(text)
+    return float(match[1]) / float(match[2]) if match else None
+
+# Storage kind of a raw column: "int", "float", "category" or "string". Text
+# columns whose every value is a ratio are read as floats.
+def _raw_kind(values):
+    if pd.api.types.is_integer_dtype(values):
+        return "int"
+    if pd.api.types.is_float_dtype(values):
+        return "float"
+    present = values.dropna().astype(str)
+    if len(present) and all(_fraction(text) is not None for text in present):
+        return "float"
+    if present.nunique() <= CATEGORY_SHARE * len(values):
+        return "category"
+    return "string"
+
+# Storage kind of a typed column, from its dtype
+def _kind(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return "category"
+    if pd.api.types.is_integer_dtype(values):
+        return "int"
+    if pd.api.types.is_numeric_dtype(values):
+        return "float"
+    return "string"
+
+# Parse the raw CSV into a typed DataFrame. Numbers (including Inf) become float64,
+# integer columns keep int64, and text is split into categoricals and strings.
+def parse_source(path=SOURCE):
+    raw = pd.read_csv(path)
+    table = {}
+    for name in raw.columns:
+        kind, values = _raw_kind(raw[name]), raw[name]
+        if kind == "float" and not pd.api.types.is_float_dtype(values):
+            values = values.map(lambda text: np.nan if pd.isna(text) else _fraction(str(text))).astype(float)
+        elif kind == "category":
+            values = values.astype("category")
+        elif kind == "string":
+            values = values.astype("string")
+        table[name] = values
+    return pd.DataFrame(table)
+
+def source_hash(path=SOURCE):
+    return files_hash([path], f"version {CACHE_VERSION}")
+
+def cache_path(path=SOURCE):
+    return os.path.join(CACHE_DIR, source_hash(path))
+
+def _read_schema(target):
+    with open(os.path.join(target, "schema.json"), encoding="utf-8") as schema_file:
+        return json.load(schema_file)
+
+# Write a typed table as one directory: numbers.npy (float64, one row per numeric
+# column, so each column is contiguous), codes.npy (int32 codes of every text
+# column, -1 for missing) and schema.json (column order, kinds and text values).
+# Both arrays are memory-mapped on load.
+def write_table(table, target):
+    kinds = {name: _kind(table[name]) for name in table.columns}
+    numeric = [name for name, kind in kinds.items() if kind in ("int", "float")]
+    text = [name for name, kind in kinds.items() if kind in ("category", "string")]
+
+    numbers = np.empty((len(numeric), len(table)))
+    for index, name in enumerate(numeric):
+        numbers[index] = table[name].to_numpy(dtype=float, na_value=np.nan)
+    codes = np.empty((len(text), len(table)), dtype=np.int32)
+    values = {}
+    for index, name in enumerate(text):
+        categorical = pd.Categorical(table[name].astype(object))
+        codes[index] = categorical.codes
+        values[name] = [str(value) for value in categorical.categories]
+
+    schema = dict(columns=[[name, kind] for name, kind in kinds.items()], numeric=numeric, text=text,
+                  values=values, rows=len(table))
+
+    def write(partial):
+        np.save(os.path.join(partial, "numbers.npy"), numbers)
+        np.save(os.path.join(partial, "codes.npy"), codes)
+        with open(os.path.join(partial, "schema.json"), "w", encoding="utf-8") as schema_file:
+            json.dump(schema, schema_file, ensure_ascii=False)
+    return atomic_write(target, write, directory=True)
+
+# Typed DataFrame of one cache directory, kept per process (directory names are
+# content hashes, so an entry never goes stale). Callers get the shared frame;
+# copy it before changing it.
+@lru_cache(maxsize=8)
+def read_table(target):
+    schema = _read_schema(target)
+    numbers = np.load(os.path.join(target, "numbers.npy"), mmap_mode="r")
+    codes = np.load(os.path.join(target, "codes.npy"), mmap_mode="r")
+    numeric_row = {name: index for index, name in enumerate(schema["numeric"])}
+    text_row = {name: index for index, name in enumerate(schema["text"])}
+
+    data = {}
+    for name, kind in schema["columns"]:
+        if kind in ("int", "float"):
+            data[name] = np.array(numbers[numeric_row[name]], dtype=np.int64 if kind == "int" else float)
+        else:
+            values = np.array(schema["values"][name] + [None], dtype=object)[codes[text_row[name]]]
+            data[name] = pd.Categorical(values) if kind == "category" else pd.array(values, dtype="string")
+    return pd.DataFrame(data)
+
+def build_cache(path=SOURCE):
+    return write_table(parse_source(path), cache_path(path))
+
+# Element table as a DataFrame with typed columns, from the cache of the current
+# source file (built on first use, and again whenever the file changes). Same
+# column order and names as the CSV. Each call returns its own copy.
+def load_element_data(path=SOURCE):
+    target = cache_path(path)
+    if not os.path.exists(os.path.join(target, "schema.json")):
+        target = build_cache(path)
+    return read_table(target).copy()
+
+# Build (or reuse) the cache and report cold and warm load times, e.g.
+#   python element_data.py
+#   python element_data.py --rebuild
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse the element table into its typed cache")
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild even if a cache exists")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        shutil.rmtree(cache_path(args.source), ignore_errors=True)
+    start = time.perf_counter()
+    table = load_element_data(args.source)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(20):
+        load_element_data(args.source)
+    warm = (time.perf_counter() - start) / 20
+
+    start = time.perf_counter()
+    pd.read_csv(args.source)
+    csv = time.perf_counter() - start
+
+    kinds = pd.Series(dict(_read_schema(cache_path(args.source))["columns"]))
+    print(f"{len(table)} elements, {table.shape[1]} columns ({', '.join(f'{n} {k}' for k, n in kinds.value_counts().items())})")
+    print(f"first load {first * 1e3:.1f} ms  cached load {warm * 1e3:.1f} ms  read_csv {csv * 1e3:.1f} ms")
@@ -0,0 +1,150 @@
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from disk_cache import files_hash
+from element_data import CACHE_DIR, SOURCE, parse_source, read_table, write_table
+
+# First ionization energies (eV) of elements 1-103, NIST Atomic Spectra Database;
+# the raw table has none
+IONIZATION_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ionization_energies.csv")
+
+# Bump when the build below changes, so every app picks up the new dataset
+DATASET_VERSION = 2
+
+# Unit conversions
+PICOMETRES_PER_METRE = 1e12
+KJ_PER_MOL_PER_EV = 96.485332
+G_PER_CM3_PER_KG_PER_M3 = 1e-3
+
+# Subshells in filling (Madelung) order, with their n and l
+SUBSHELLS = ("1s", "2s", "2p", "3s", "3p", "4s", "3d", "4p", "5s", "4d", "5p",
+             "6s", "4f", "5d", "6p", "7s", "5f", "6d", "7p")
+SUBSHELL_N = np.array([int(name[0]) for name in SUBSHELLS])
+SUBSHELL_L = np.array(["spdf".index(name[1]) for name in SUBSHELLS])
+CAPACITY = 2 * (2 * SUBSHELL_L + 1)
+
+# Noble-gas cores written as [X] in configurations, by electron count
+CORES = {"He": 2, "Ne": 10, "Ar": 18, "Kr": 36, "Xe": 54, "Rn": 86}
+
+# One subshell of a configuration string such as "[Xe]4f145d106s2". Counts are
+# bounded by the subshell capacity, so "4f56s2" reads as 4f⁵ 6s², not 4f⁵⁶.
+SUBSHELL_TERM = re.compile(r"(\d)(?:(s)([12])|(p)([1-6])|(d)(10|[1-9])|(f)(1[0-4]|[1-9]))")
+
+# Dataset column holding the electron count of one subshell
+def occupancy_column(subshell):
+    return f"Occupancy.{subshell}"
+
+# Occupancy of every subshell when `electrons` are filled in Madelung order
+def aufbau(electrons):
+    electrons = np.asarray(electrons)[..., np.newaxis]
+    filled_before = np.concatenate([[0], np.cumsum(CAPACITY)[:-1]])
+    return np.clip(electrons - filled_before, 0, CAPACITY)
+
+# Occupancy matrix (configurations x SUBSHELLS) of configuration strings
+def occupancy(configurations):
+    explicit = np.zeros((len(configurations), len(SUBSHELLS)), dtype=int)
+    core = np.zeros(len(configurations), dtype=int)
+    for row, configuration in enumerate(configurations):
+        match = re.match(r"\[(\w+)\]", configuration)
+        if match:
+            core[row] = CORES[match[1]]
+        for term in SUBSHELL_TERM.finditer(configuration[match.end() if match else 0:]):
+            n, l, count = term[1], *(part for part in term.groups()[1:] if part)
+            explicit[row, SUBSHELLS.index(n + l)] = int(count)
+    return aufbau(core) + explicit
+
+# Canonical element table from the typed raw table and the ionization energies:
+# one row per element in atomic-number order, SI-prefixed units (pm, kJ/mol,
+# g/cm³, K), the derived electron-shell columns and the occupancy matrix (one
+# Occupancy.<subshell> column per subshell, see occupancy_matrix).
+#
+# The raw Electron_Configuration column is shuffled between rows (He carries
+# Pm's "[Xe]4f56s2"); each configuration is put back on the element whose atomic
+# number equals its electron count.
+def build_dataset(raw, ionization):
+    raw = raw.sort_values("Atomic_Number", ignore_index=True)
+    configurations = raw["Electron_Configuration"].to_numpy(dtype=object)
+    shells = occupancy(configurations)
+    electrons = shells.sum(axis=1)
+    if sorted(electrons) != list(raw["Atomic_Number"]):
+        raise ValueError("electron configurations do not match the atomic numbers")
+    order = np.argsort(electrons)
+    configurations, shells = configurations[order], shells[order]
+
+    occupied = shells > 0
+    outer_shell = (occupied * SUBSHELL_N).max(axis=1)
+    outer_electrons = (shells * (SUBSHELL_N == outer_shell[:, np.newaxis])).sum(axis=1)
+    closed = outer_electrons == np.where(outer_shell == 1, 2, 8)
+    # 원자가 전자수: 주족 원소(s, p 구역)만 정의, 18족은 0
+    main_group = raw["Block"].isin(["s", "p"]).to_numpy()
+    valence = np.where(main_group, np.where(closed, 0, outer_electrons), np.nan)
+
+    ionization_eV = ionization.set_index("Atomic_Number")["Ionization_Energy_eV"].reindex(raw["Atomic_Number"])
+    table = pd.DataFrame({
+        "Atomic_Number": raw["Atomic_Number"],
+        "Symbol": raw["Symbol"],
+        "Name": raw["Name"],
+        "Atomic_Mass": raw["Atomic_Weight"],
+        "Period": raw["Period"],
+        "Group": raw["Group"],
+        "Block": raw["Block"],
+        "Graph.Period": raw["Graph.Period"],
+        "Graph.Group": raw["Graph.Group"],
+        "Phase": raw["Phase"],
+        "Electron_Configuration": pd.array(configurations, dtype="string"),
+        "Atomic_Radius": raw["Atomic_Radius"] * PICOMETRES_PER_METRE,
+        "Covalent_Radius": raw["Covalent_Radius"] * PICOMETRES_PER_METRE,
+        "Van_der_Waals_Radius": raw["Van_der_Waals_Radius"] * PICOMETRES_PER_METRE,
+        "Electronegativity": raw["Electronegativity"],
+        "Electron_Affinity": raw["ElectronAffinity"],
+        "Ionization_Energy": ionization_eV.to_numpy() * KJ_PER_MOL_PER_EV,
+        "Density": raw["Density"] * G_PER_CM3_PER_KG_PER_M3,
+        "Melting_Point": raw["Melting_Point"],
+        "Boiling_Point": raw["Boiling_Point"],
+        "Outer_Shell": outer_shell,
+        "Outer_Shell_Electrons": outer_electrons,
+        "Valence_Electrons": valence,
+    })
+    occupancies = pd.DataFrame(shells, columns=[occupancy_column(name) for name in SUBSHELLS])
+    return pd.concat([table, occupancies], axis=1)
+
+# Occupancy matrix (elements x SUBSHELLS) stored in the dataset
+def occupancy_matrix(dataset):
+    return dataset[[occupancy_column(name) for name in SUBSHELLS]].to_numpy(dtype=int)
+
+# Content hash of the dataset: both source files and the build version
+def dataset_hash(source=SOURCE, ionization_source=IONIZATION_SOURCE):
+    return files_hash([source, ionization_source], f"dataset {DATASET_VERSION}")
+
+def dataset_path(source=SOURCE, ionization_source=IONIZATION_SOURCE):
+    return os.path.join(CACHE_DIR, f"dataset-{dataset_hash(source, ionization_source)}")
+
+# Canonical element table, read from its precomputed artifact or built and saved
+# on first use. Every app calls this, so they all see the same table. Each call
+# returns its own copy.
+def load_dataset(source=SOURCE, ionization_source=IONIZATION_SOURCE):
+    target = dataset_path(source, ionization_source)
+    if not os.path.exists(os.path.join(target, "schema.json")):
+        write_table(build_dataset(parse_source(source), pd.read_csv(ionization_source)), target)
+    return read_table(target).copy()
+
+# Build (or reuse) the canonical dataset and print its version and columns, e.g.
+#   python element_dataset.py
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the canonical element dataset")
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--ionization-source", default=IONIZATION_SOURCE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    dataset = load_dataset(args.source, args.ionization_source)
+    loaded = time.perf_counter() - start
+    print(f"dataset {dataset_hash(args.source, args.ionization_source)}: {len(dataset)} elements, "
+          f"{dataset.shape[1]} columns, load/build {loaded * 1e3:.1f} ms")
+    print(f"  {dataset_path(args.source, args.ionization_source)}")
+    print(dataset.drop(columns=[occupancy_column(name) for name in SUBSHELLS]).head(20).to_string())
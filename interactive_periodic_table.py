@@ -1,19 +1,20 @@
 import pandas as pd
 import plotly.express as px
 
-# Sample data for the periodic table
-data = {
-    "Element": ["Hydrogen", "Helium", "Lithium", "Beryllium", "Boron", "Carbon", "Nitrogen", "Oxygen", "Fluorine", "Neon"],
-    "Symbol": ["H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne"],
-    "Atomic_Number": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-    "Group": [1, 18, 1, 2, 13, 14, 15, 16, 17, 18],
-    "Period": [1, 1, 2, 2, 2, 2, 2, 2, 2, 2],
-    "Electronegativity": [2.2, None, 0.98, 1.57, 2.04, 2.55, 3.04, 3.44, 3.98, None],
-    "State": ["Gas", "Gas", "Solid", "Solid", "Solid", "Solid", "Gas", "Gas", "Gas", "Gas"],
-}
+from element_dataset import load_dataset
 
-# Create DataFrame
-df = pd.DataFrame(data)
+# All 118 elements from the canonical dataset, placed by their periodic-table
+# layout position (the f-block sits in two rows below the main table)
+dataset = load_dataset()
+df = pd.DataFrame({
+    "Element": dataset["Name"].astype(str),
+    "Symbol": dataset["Symbol"].astype(str),
+    "Atomic_Number": dataset["Atomic_Number"],
+    "Group": dataset["Graph.Group"],
+    "Period": dataset["Graph.Period"],
+    "Electronegativity": dataset["Electronegativity"],
+    "State": dataset["Phase"].astype(object).fillna("Unknown"),
+})
 
 # Handle missing values by replacing NaN with 0
 df["Electronegativity"] = df["Electronegativity"].fillna(0)
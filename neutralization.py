@@ -0,0 +1,335 @@
+import numpy as np
+
+# Distance below which an H⁺ and an OH⁻ react
+COLLISION_THRESHOLD = 0.05
+
+# Cell list (spatial hash) over a fixed point set: points are bucketed into square
+# cells of side cell_size and sorted by cell key, so each cell is one contiguous slice.
+class CellGrid:
+    def __init__(self, points, cell_size, origin=None):
+        self.points = points
+        self.cell_size = cell_size
+        self.origin = points.min(axis=0) if origin is None else origin
+        cells = self.cells(points)
+        # +2 leaves room for the -1/+1 neighbour offsets without keys aliasing
+        self.stride = int(cells[:, 1].max()) + 2 if len(points) else 2
+        keys = cells[:, 0] * self.stride + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    # +1 keeps neighbour cells (-1 offset) non-negative
+    def cells(self, points):
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64) + 1
+
+    # Candidate pairs (i, j) of query point i and grid point j in touching cells.
+    # Any pair closer than cell_size is guaranteed to be among the candidates.
+    def query(self, points):
+        if len(points) == 0 or len(self.points) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        cells = self.cells(points)
+        index = np.arange(len(points))
+        pairs_i, pairs_j = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                keys = (cells[:, 0] + dx) * self.stride + (cells[:, 1] + dy)
+                start = np.searchsorted(self.sorted_keys, keys, side="left")
+                counts = np.searchsorted(self.sorted_keys, keys, side="right") - start
+                total = counts.sum()
+                if total == 0:
+                    continue
+                # Expand every [start, start + count) slice into flat indices
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                pairs_i.append(np.repeat(index, counts))
+                pairs_j.append(self.order[np.repeat(start, counts) + offsets])
+
+        if not pairs_i:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+# Candidate pairs (i, j) of a_positions[i] and b_positions[j] within one cell of each other
+def neighbor_pairs(a_positions, b_positions, cell_size):
+    if len(a_positions) == 0 or len(b_positions) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    origin = np.minimum(a_positions.min(axis=0), b_positions.min(axis=0))
+    return CellGrid(b_positions, cell_size, origin).query(a_positions)
+
+# Pairs (i, j) from query() that are really closer than threshold, sorted by (i, j)
+def _close_pairs(grid, points, threshold):
+    i, j = grid.query(points)
+    diff = points[i] - grid.points[j]
+    close = np.sqrt(np.einsum("ij,ij->i", diff, diff)) < threshold
+    # One combined key sorts faster than lexsort on (i, j)
+    keys = np.sort(i[close] * len(grid.points) + j[close])
+    return keys // len(grid.points), keys % len(grid.points)
+
+# Upper bound on candidate pairs held in memory at once
+_CANDIDATE_BUDGET = 2_000_000
+
+# All acid/base pairs closer than the threshold, resolved one-to-one.
+# Matching is greedy in (acid index, base index) order, which is exactly what the
+# original nested while loop did: each acid takes the first free base in range.
+# Each acid keeps at most max_candidates bases (by default as many as the memory
+# budget allows, which is every candidate unless the box is packed with thousands of
+# particles); an acid whose kept bases are all taken simply waits for the next step.
+def find_reactions(acid_positions, base_positions, threshold=COLLISION_THRESHOLD, max_candidates=None):
+    n_acid, n_base = len(acid_positions), len(base_positions)
+    if n_acid == 0 or n_base == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Size acid chunks from the expected number of bases in the 3x3 neighbourhood
+    extent = max(float(np.ptp(base_positions, axis=0).max()), threshold)
+    expected = 9 * n_base * (threshold / extent) ** 2 + 1
+    chunk = max(1, int(_CANDIDATE_BUDGET // expected))
+    if max_candidates is None:
+        max_candidates = max(8, _CANDIDATE_BUDGET // n_acid)
+
+    origin = np.minimum(acid_positions.min(axis=0), base_positions.min(axis=0))
+    grid = CellGrid(base_positions, threshold, origin)
+
+    pairs_i, pairs_j = [], []
+    for lo in range(0, n_acid, chunk):
+        i, j = _close_pairs(grid, acid_positions[lo:lo + chunk], threshold)
+        if len(i) == 0:
+            continue
+
+        # Rank of each pair within its acid's sorted candidate list
+        _, first, counts = np.unique(i, return_index=True, return_counts=True)
+        keep = np.arange(len(i)) - np.repeat(first, counts) < max_candidates
+        pairs_i.append(i[keep] + lo)
+        pairs_j.append(j[keep])
+
+    if not pairs_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+
+    acids, first = np.unique(i, return_index=True)
+    bounds = np.append(first, len(i)).tolist()
+    candidates = j.tolist()
+    base_used = np.zeros(n_base, dtype=bool)
+    acid_idx, base_idx = [], []
+    for k, a in enumerate(acids.tolist()):
+        for b in candidates[bounds[k]:bounds[k + 1]]:
+            if not base_used[b]:
+                base_used[b] = True
+                acid_idx.append(a)
+                base_idx.append(b)
+                break
+
+    return np.array(acid_idx, dtype=np.int64), np.array(base_idx, dtype=np.int64)
+
+
+# Sum over j of the unit vectors from points[i] towards targets[j], computed exactly
+# with broadcasting. Acids are taken in chunks so the pair matrix stays bounded.
+def _exact_field(points, targets):
+    field = np.zeros_like(points, dtype=float)
+    if len(points) == 0 or len(targets) == 0:
+        return field
+    chunk = max(1, _CANDIDATE_BUDGET // len(targets))
+    for lo in range(0, len(points), chunk):
+        direction = targets[np.newaxis, :, :] - points[lo:lo + chunk, np.newaxis, :]
+        distance = np.sqrt(np.einsum("ijk,ijk->ij", direction, direction))
+        # Coincident pairs contribute nothing (avoid division by zero)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            unit = np.where(distance[..., np.newaxis] > 0, direction / distance[..., np.newaxis], 0.0)
+        field[lo:lo + chunk] = unit.sum(axis=1)
+    return field
+
+# Same sum, approximated Barnes–Hut style on a grid_size x grid_size grid: targets in
+# the 3x3 cells around a point are summed exactly, every farther cell is replaced by
+# its particle count pulling towards its centre of mass.
+def _approximate_field(points, targets, grid_size):
+    field = np.zeros_like(points, dtype=float)
+    if len(points) == 0 or len(targets) == 0:
+        return field
+
+    origin = np.minimum(points.min(axis=0), targets.min(axis=0))
+    extent = max(float((np.maximum(points.max(axis=0), targets.max(axis=0)) - origin).max()), 1e-12)
+    grid = CellGrid(targets, extent / grid_size, origin)
+
+    # Near field: exact pairs in touching cells
+    i, j = grid.query(points)
+    direction = targets[j] - points[i]
+    distance = np.sqrt(np.einsum("ij,ij->i", direction, direction))
+    moving = distance > 0
+    unit = direction[moving] / distance[moving, np.newaxis]
+    field[:, 0] += np.bincount(i[moving], weights=unit[:, 0], minlength=len(points))
+    field[:, 1] += np.bincount(i[moving], weights=unit[:, 1], minlength=len(points))
+
+    # Far field: one pseudo-particle per occupied cell
+    target_cells = grid.cells(targets)
+    cell_keys, inverse, counts = np.unique(
+        target_cells[:, 0] * grid.stride + target_cells[:, 1], return_inverse=True, return_counts=True
+    )
+    centers = np.column_stack([
+        np.bincount(inverse, weights=targets[:, 0]),
+        np.bincount(inverse, weights=targets[:, 1]),
+    ]) / counts[:, np.newaxis]
+    cell_x, cell_y = cell_keys // grid.stride, cell_keys % grid.stride
+
+    point_cells = grid.cells(points)
+    chunk = max(1, _CANDIDATE_BUDGET // len(cell_keys))
+    for lo in range(0, len(points), chunk):
+        block = points[lo:lo + chunk]
+        cells = point_cells[lo:lo + chunk]
+        far = (np.abs(cells[:, 0, np.newaxis] - cell_x) > 1) | (np.abs(cells[:, 1, np.newaxis] - cell_y) > 1)
+        direction = centers[np.newaxis, :, :] - block[:, np.newaxis, :]
+        distance = np.sqrt(np.einsum("ijk,ijk->ij", direction, direction))
+        weight = np.where(far, counts / np.where(far, distance, 1.0), 0.0)
+        field[lo:lo + chunk] += np.einsum("ij,ijk->ik", weight, direction)
+    return field
+
+# Displacements of every H⁺ and OH⁻ from their mutual attraction in one step.
+# Each pair pulls both particles towards each other by attraction_strength along the
+# line between them, using positions at the start of the step so the result does not
+# depend on particle order. method="exact" sums every pair (O(N·M)); "approximate"
+# uses a Barnes–Hut style grid and scales to thousands of particles.
+def attraction_displacements(acid_positions, base_positions, attraction_strength, method="exact", grid_size=None):
+    if grid_size is None:
+        # Balances near-field pairs (~N²/G²) against far-field cells (~N·G²)
+        n = len(acid_positions) + len(base_positions)
+        grid_size = int(np.clip(round((9 * n) ** 0.25), 4, 64))
+    if method == "exact":
+        acid_field = _exact_field(acid_positions, base_positions)
+        base_field = _exact_field(base_positions, acid_positions)
+    elif method == "approximate":
+        acid_field = _approximate_field(acid_positions, base_positions, grid_size)
+        base_field = _approximate_field(base_positions, acid_positions, grid_size)
+    else:
+        raise ValueError(f"Unknown attraction method: {method}")
+    return attraction_strength * acid_field, attraction_strength * base_field
+
+# Random source for the simulations: None keeps the global np.random state, a
+# numpy Generator (or np.random itself) is used as is, and anything else (an int
+# seed or a SeedSequence) seeds a fresh Generator so the run is reproducible
+def make_rng(rng=None):
+    if rng is None:
+        return np.random
+    if rng is np.random or isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+# Species codes for ParticleStore
+ACID, BASE, WATER = 0, 1, 2
+
+# Random-walk step (±) per species
+STEP_SIZES = np.array([0.03, 0.03, 0.015])
+
+# Fixed-capacity structure-of-arrays particle container. Every particle is one slot
+# with a position, a species code and an alive flag.
+# A reaction only rewrites slots in place: the H⁺ slot becomes the H₂O at the
+# midpoint and the OH⁻ slot is marked dead. Appends reuse the spare capacity and
+# only reallocate (compacting dead slots, doubling if still full) when it runs out.
+class ParticleStore:
+    def __init__(self, capacity=64):
+        self.positions = np.empty((capacity, 2))
+        self.species = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0  # slots in use, alive or dead
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    # Add particles of one species; returns their slot indices
+    def append(self, positions, species):
+        n = len(positions)
+        if self.count + n > self.capacity:
+            self._make_room(n)
+        slots = np.arange(self.count, self.count + n)
+        self.positions[slots] = positions
+        self.species[slots] = species
+        self.alive[slots] = True
+        self.count += n
+        return slots
+
+    # Drop dead slots (keeping the order of the live ones) and grow if still too small
+    def _make_room(self, n):
+        live = np.flatnonzero(self.alive[:self.count])
+        capacity = self.capacity
+        while len(live) + n > capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            for name in ("positions", "species", "alive"):
+                old = getattr(self, name)
+                new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:len(live)] = old[live]
+                setattr(self, name, new)
+        else:
+            for array in (self.positions, self.species, self.alive):
+                array[:len(live)] = array[live]
+            self.alive[len(live):] = False
+        self.count = len(live)
+
+    # Slot indices of the live particles of one species, in insertion order
+    def indices(self, species):
+        n = self.count
+        return np.flatnonzero(self.alive[:n] & (self.species[:n] == species))
+
+    def positions_of(self, species):
+        return self.positions[self.indices(species)]
+
+    # Number of live particles per species, indexed by ACID, BASE, WATER
+    def counts(self):
+        n = self.count
+        return np.bincount(self.species[:n][self.alive[:n]], minlength=3)
+
+    def kill(self, slots):
+        self.alive[slots] = False
+
+    # Turn each acid slot into water at the given position and retire the base slot
+    def react(self, acid_slots, base_slots, water_positions):
+        self.positions[acid_slots] = water_positions
+        self.species[acid_slots] = WATER
+        self.alive[base_slots] = False
+
+    # Random motion with the per-species step size, kept inside the unit box.
+    # rng is anything make_rng accepts
+    def move(self, rng=None):
+        rng = make_rng(rng)
+        n = self.count
+        positions = self.positions[:n]
+        positions += rng.uniform(-1, 1, (n, 2)) * STEP_SIZES[self.species[:n], np.newaxis]
+        np.clip(positions, 0, 1, out=positions)
+
+# Particles drawn per mole of H⁺ or OH⁻ (the export CLI, the runner and ti_model.py)
+PARTICLES_PER_MOLE = 10
+
+# Number of particles for a solution of the given concentration (mol/L) and volume (mL)
+def particle_count(concentration, volume_ml):
+    return int(concentration * volume_ml / 1000.0 * PARTICLES_PER_MOLE)
+
+# Random starting positions; rng is anything make_rng accepts
+def initialize_particles(acid_count, base_count, rng=None):
+    rng = make_rng(rng)
+    acid_positions = rng.random((acid_count, 2))
+    base_positions = rng.random((base_count, 2))
+    water_positions = np.empty((0, 2))
+    return acid_positions, base_positions, water_positions
+
+# One physics step shared by all neutralization models: attraction (if any),
+# reactions, random motion and wall clipping. Returns the new positions plus the
+# midpoints where reactions happened this step.
+def step_particles(acid_positions, base_positions, water_positions, attraction_strength=0.0,
+                   rng=None, attraction_method="exact"):
+    rng = make_rng(rng)
+
+    if attraction_strength:
+        acid_shift, base_shift = attraction_displacements(
+            acid_positions, base_positions, attraction_strength, attraction_method
+        )
+        acid_positions = acid_positions + acid_shift
+        base_positions = base_positions + base_shift
+
+    acid_idx, base_idx = find_reactions(acid_positions, base_positions)
+    reaction_positions = (acid_positions[acid_idx] + base_positions[base_idx]) / 2
+    if len(acid_idx):
+        acid_positions = np.delete(acid_positions, acid_idx, axis=0)
+        base_positions = np.delete(base_positions, base_idx, axis=0)
+        water_positions = np.vstack([water_positions, reaction_positions])
+
+    acid_positions = np.clip(acid_positions + rng.uniform(-0.03, 0.03, acid_positions.shape), 0, 1)
+    base_positions = np.clip(base_positions + rng.uniform(-0.03, 0.03, base_positions.shape), 0, 1)
+    water_positions = np.clip(water_positions + rng.uniform(-0.015, 0.015, water_positions.shape), 0, 1)
+    return acid_positions, base_positions, water_positions, reaction_positions
@@ -0,0 +1,163 @@
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Total particle counts (H⁺ + OH⁻, split evenly) to time each model at
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+
+# The Streamlit scripts, how to build their initial state from a total count N, extra
+# update_particles arguments and the largest N worth timing (the exact all-pairs
+# attraction needs minutes per step at 100k). Importing a script outside
+# `streamlit run` only defines its functions: the widgets return their defaults and
+# the start button is never pressed.
+MODELS = {
+    "ti_model": ("ti_model.py", lambda n: (n // 2, n // 2), (), None),
+    "simple": ("중화반응모형.py", lambda n: (n // 2, n // 2), (), None),
+    "attraction": ("중화반응모형(수정).py", lambda n: (n // 2, n // 2), (0.01,), 10_000),
+}
+
+# Relative slowdown (or memory growth) tolerated before a result counts as a regression
+TOLERANCE = 0.2
+
+DEFAULT_BASELINE = "neutralization_benchmark.json"
+
+# Load a model script as a module
+def _load_model(name, filename):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Identifies the machine a baseline was recorded on; timings from elsewhere are not comparable
+def machine_info():
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+# Time initialize_particles and update_particles for one model at one size.
+# Steps run until min_time has passed (at least one step, at most max_steps) or the
+# reaction finishes. Peak memory is measured in a second, shorter run under
+# tracemalloc so its bookkeeping does not distort the timings.
+def benchmark_case(module, counts, extra_args, seed=0, min_time=1.0, max_steps=1000, memory_steps=5):
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    particles = module.initialize_particles(*counts, rng)
+    init_seconds = time.perf_counter() - start
+
+    steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while steps < max_steps and (steps == 0 or elapsed < min_time):
+        remaining = particles.counts()
+        if remaining[0] == 0 or remaining[1] == 0:
+            break
+        module.update_particles(particles, *extra_args, rng)
+        steps += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        rng = np.random.default_rng(seed)
+        particles = module.initialize_particles(*counts, rng)
+        for _ in range(min(steps, memory_steps)):
+            module.update_particles(particles, *extra_args, rng)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "init_seconds": init_seconds,
+        "steps": steps,
+        "steps_per_second": steps / elapsed if elapsed > 0 else float("inf"),
+        "peak_memory_bytes": peak_memory,
+    }
+
+# Run every model at every size; returns {"machine": ..., "results": {model: {N: case}}}
+def run_benchmarks(models=tuple(MODELS), sizes=SIZES, seed=0, min_time=1.0, max_steps=1000,
+                   all_sizes=False, log=print):
+    results = {}
+    for name in models:
+        filename, make_counts, extra_args, max_size = MODELS[name]
+        module = _load_model(name, filename)
+        results[name] = {}
+        for n in sizes:
+            if max_size is not None and n > max_size and not all_sizes:
+                log(f"{name:>10} N={n:>7}: skipped (above {max_size}, use --all-sizes)")
+                continue
+            case = benchmark_case(module, make_counts(n), extra_args, seed, min_time, max_steps)
+            results[name][str(n)] = case
+            log(f"{name:>10} N={n:>7}: {case['steps_per_second']:10.1f} steps/s, "
+                f"init {case['init_seconds'] * 1000:8.2f} ms, peak {case['peak_memory_bytes'] / 1e6:8.2f} MB")
+    return {"machine": machine_info(), "seed": seed, "results": results}
+
+# Cases that got slower or used more memory than the baseline by more than tolerance.
+# Returns a list of messages; empty when nothing regressed or nothing is comparable.
+def find_regressions(baseline, current, tolerance=TOLERANCE):
+    regressions = []
+    for name, sizes in current["results"].items():
+        for n, case in sizes.items():
+            base = baseline["results"].get(name, {}).get(n)
+            if base is None:
+                continue
+            if case["steps_per_second"] < base["steps_per_second"] * (1 - tolerance):
+                regressions.append(f"{name} N={n}: {case['steps_per_second']:.1f} steps/s "
+                                   f"(baseline {base['steps_per_second']:.1f})")
+            if case["peak_memory_bytes"] > base["peak_memory_bytes"] * (1 + tolerance):
+                regressions.append(f"{name} N={n}: peak {case['peak_memory_bytes'] / 1e6:.2f} MB "
+                                   f"(baseline {base['peak_memory_bytes'] / 1e6:.2f} MB)")
+    return regressions
+
+# Record a baseline on the first run, compare against it afterwards, e.g.
+#   python neutralization_benchmark.py                      # record or compare
+#   python neutralization_benchmark.py --sizes 10 100 1000  # quick check
+#   python neutralization_benchmark.py --update             # accept the current numbers
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the neutralization models")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="total particle counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds of stepping per case")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--all-sizes", action="store_true", help="also run sizes above a model's limit")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="overwrite the baseline with this run")
+    args = parser.parse_args()
+
+    # Streamlit warns about the missing script context on every widget call
+    import streamlit  # noqa: F401  (creates the logger silenced below)
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+    current = run_benchmarks(args.models, args.sizes, args.seed, args.min_time, args.max_steps, args.all_sizes)
+
+    if args.update or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["machine"] != current["machine"] or baseline.get("seed") != current["seed"]:
+        print("Baseline was recorded on a different machine or seed; not comparing (use --update)")
+        sys.exit(0)
+
+    regressions = find_regressions(baseline, current, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print("No regressions against the baseline")
+    sys.exit(1 if regressions else 0)
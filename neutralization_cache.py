@@ -0,0 +1,106 @@
+import os
+import zipfile
+
+import numpy as np
+
+from disk_cache import atomic_write, params_hash
+from neutralization_events import event_trajectory
+from neutralization_runner import MAX_STEPS, run_trajectory
+
+# Everything the neutralization tools keep on disk lives under here
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".neutralization_cache")
+
+# Total size the trajectory cache may use before the least recently used runs go
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# Bump when the simulations change, so stale cached runs are not replayed
+CACHE_VERSION = 1
+
+# Engines whose runs can be cached, all returning the run_trajectory format
+ENGINES = {
+    "random_walk": lambda acid, base, attraction, seed, max_steps: run_trajectory(
+        acid, base, attraction, seed, max_steps),
+    "event_driven": lambda acid, base, attraction, seed, max_steps: event_trajectory(
+        acid, base, seed=seed, max_steps=max_steps),
+}
+
+# Flatten a trajectory into a few arrays: per frame its step and the number of acid,
+# base, water and reaction positions, plus every position in order (as float32)
+def _pack(trajectory):
+    steps = np.array([frame[0] for frame in trajectory], dtype=np.int64)
+    sizes = np.array([[len(part) for part in frame[1:]] for frame in trajectory], dtype=np.int64).reshape(-1, 4)
+    parts = [np.asarray(part, dtype=np.float32).reshape(-1, 2) for frame in trajectory for part in frame[1:]]
+    positions = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.float32)
+    return {"steps": steps, "sizes": sizes, "positions": positions}
+
+def _unpack(steps, sizes, positions):
+    bounds = np.concatenate([[0], np.cumsum(sizes.ravel())])
+    parts = [positions[lo:hi].astype(float) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    return [(int(step), *parts[4 * k:4 * k + 4]) for k, step in enumerate(steps)]
+
+# Compressed on-disk store of simulated trajectories with LRU eviction. Every run is
+# one .npz file named by a hash of its parameters; reading a run refreshes its
+# modification time, and writing one evicts the oldest files beyond max_bytes.
+class TrajectoryCache:
+    def __init__(self, directory=os.path.join(CACHE_ROOT, "trajectories"), max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, params):
+        return os.path.join(self.directory, params_hash(dict(params, version=CACHE_VERSION), 20) + ".npz")
+
+    # Cached trajectory for these parameters, or None. A damaged entry is removed,
+    # so the run is simulated and cached again.
+    def get(self, params):
+        path = self.path(params)
+        try:
+            with np.load(path) as data:
+                trajectory = _unpack(data["steps"], data["sizes"], data["positions"])
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        os.utime(path)
+        return trajectory
+
+    def put(self, params, trajectory):
+        packed = _pack(trajectory)
+        atomic_write(self.path(params), lambda partial: np.savez_compressed(partial, **packed), ".npz")
+        self.evict()
+
+    # Drop least recently used runs until the cache fits in max_bytes
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz") and ".partial" not in entry.name:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+# Trajectory of one run, replayed from the cache when the same parameters ran before.
+# An unseeded run (seed=None) is a fresh random sample every time, so it is simulated
+# and never read from or written to the cache.
+def cached_trajectory(acid_count, base_count, attraction_strength=0.0, seed=None, max_steps=MAX_STEPS,
+                      engine="random_walk", cache=None):
+    if seed is None:
+        return ENGINES[engine](acid_count, base_count, attraction_strength, seed, max_steps)
+    cache = TrajectoryCache() if cache is None else cache
+    params = dict(engine=engine, acid_count=int(acid_count), base_count=int(base_count),
+                  attraction_strength=float(attraction_strength), seed=seed, max_steps=int(max_steps))
+    trajectory = cache.get(params)
+    if trajectory is None:
+        trajectory = ENGINES[engine](acid_count, base_count, attraction_strength, seed, max_steps)
+        cache.put(params, trajectory)
+    return trajectory
@@ -0,0 +1,146 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from neutralization import COLLISION_THRESHOLD, make_rng
+from neutralization_runner import MAX_STEPS
+
+# Distance a particle travels per step; about the size of the random-walk steps
+SPEED = 0.03
+
+# Event kinds in the queue
+_WALL, _REACTION = 0, 1
+
+# Event-driven H⁺/OH⁻ neutralization. Every ion flies in a straight line at constant
+# speed and bounces off the walls of the unit box, so the moment an H⁺/OH⁻ pair comes
+# within reaction range can be computed exactly. Pending wall bounces and encounters
+# sit in a priority queue and the simulation jumps from one event to the next, so
+# quiet stretches cost nothing and no pair can tunnel through each other between
+# frames. Each particle carries a version number that changes whenever its path does
+# (a bounce or a reaction); queued events for an older version are stale and skipped.
+class EventDrivenSimulation:
+    def __init__(self, acid_count, base_count, speed=SPEED, threshold=COLLISION_THRESHOLD, rng=None):
+        rng = make_rng(rng)
+        n = acid_count + base_count
+        self.threshold = threshold
+        self.is_acid = np.arange(n) < acid_count
+        self.origins = rng.random((n, 2))  # position at time self.starts
+        angles = rng.uniform(0, 2 * np.pi, n)
+        self.velocities = speed * np.column_stack([np.cos(angles), np.sin(angles)])
+        self.starts = np.zeros(n)
+        self.alive = np.ones(n, dtype=bool)
+        self.acid_count, self.base_count = acid_count, base_count
+        self.versions = np.zeros(n, dtype=np.int64)
+        self.wall_times = np.empty(n)
+        self.water = []  # positions where H₂O formed
+        self.time = 0.0
+        self.queue = []
+
+        for i in range(n):
+            self._schedule_wall(i)
+        for i in np.flatnonzero(self.is_acid):
+            self._schedule_reactions(i)
+
+    # Positions of the given particles at time t (valid until their next wall bounce)
+    def positions_at(self, index, t):
+        return self.origins[index] + self.velocities[index] * (t - self.starts[index])[..., np.newaxis]
+
+    # Current H⁺, OH⁻ and H₂O positions
+    def positions(self):
+        acid = np.flatnonzero(self.alive & self.is_acid)
+        base = np.flatnonzero(self.alive & ~self.is_acid)
+        water = np.array(self.water).reshape(-1, 2)
+        return self.positions_at(acid, self.time), self.positions_at(base, self.time), water
+
+    # Time from the start of particle i's path until it reaches the wall, per axis
+    def _wall_delays(self, i):
+        x, v = self.origins[i], self.velocities[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(v > 0, (1 - x) / v, np.where(v < 0, -x / v, np.inf))
+
+    def _schedule_wall(self, i):
+        self.wall_times[i] = self.starts[i] + self._wall_delays(i).min()
+        heapq.heappush(self.queue, (self.wall_times[i], _WALL, i, -1, self.versions[i], -1))
+
+    # Queue every encounter of particle i with a live particle of the other species that
+    # happens before either of them next hits a wall (after that both paths change)
+    def _schedule_reactions(self, i):
+        others = np.flatnonzero(self.alive & (self.is_acid != self.is_acid[i]))
+        if len(others) == 0:
+            return
+        t = self.time
+        dp = self.positions_at(others, t) - self.positions_at(i, t)
+        dv = self.velocities[others] - self.velocities[i]
+        a = np.einsum("ij,ij->i", dv, dv)
+        b = np.einsum("ij,ij->i", dp, dv)
+        c = np.einsum("ij,ij->i", dp, dp) - self.threshold ** 2
+        disc = b * b - a * c
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Earlier root of |dp + dv·τ| = threshold; pairs already in range react now
+            tau = np.where(c <= 0, 0.0, (-b - np.sqrt(disc)) / a)
+        approaching = (c <= 0) | ((b < 0) & (disc >= 0) & (a > 0))
+        times = t + tau
+        valid = approaching & (times <= np.minimum(self.wall_times[i], self.wall_times[others]))
+        for j, when in zip(others[valid].tolist(), times[valid].tolist()):
+            heapq.heappush(self.queue, (when, _REACTION, i, j, self.versions[i], self.versions[j]))
+
+    # Process events in time order up to time `until`; returns False once one species is used up
+    def advance_to(self, until):
+        while self.queue and self.queue[0][0] <= until:
+            when, kind, i, j, version_i, version_j = heapq.heappop(self.queue)
+            if not self.alive[i] or self.versions[i] != version_i:
+                continue
+            if kind == _REACTION and (not self.alive[j] or self.versions[j] != version_j):
+                continue
+
+            self.time = when
+            if kind == _WALL:
+                # Bounce: restart the straight path from the wall, placed exactly on it
+                axis = int(np.argmin(self._wall_delays(i)))
+                self.origins[i] = np.clip(self.positions_at(i, when), 0, 1)
+                self.origins[i, axis] = 1.0 if self.velocities[i, axis] > 0 else 0.0
+                self.velocities[i, axis] *= -1
+                self.starts[i] = when
+                self.versions[i] += 1
+                self._schedule_wall(i)
+                self._schedule_reactions(i)
+            else:
+                self.water.append((self.positions_at(i, when) + self.positions_at(j, when)) / 2)
+                self.alive[[i, j]] = False
+                self.versions[[i, j]] += 1
+                self.acid_count -= 1
+                self.base_count -= 1
+                if self.acid_count == 0 or self.base_count == 0:
+                    return False
+        self.time = until
+        return self.acid_count > 0 and self.base_count > 0
+
+# Run to completion and report the counts at every whole step, with the same columns
+# as neutralization_runner.run_simulation. Steps without events cost only a
+# queue peek.
+def run_event_driven(acid_count, base_count, speed=SPEED, seed=None, max_steps=MAX_STEPS):
+    simulation = EventDrivenSimulation(acid_count, base_count, speed, rng=np.random.default_rng(seed))
+    counts = [(0, acid_count, base_count, 0)]
+    step = 0
+    running = acid_count > 0 and base_count > 0
+    while running and step < max_steps:
+        step += 1
+        running = simulation.advance_to(step)
+        counts.append((step, simulation.acid_count, simulation.base_count, len(simulation.water)))
+    return pd.DataFrame(counts, columns=["step", "acid", "base", "water"])
+
+# Same run, with particle positions at every whole step in the
+# neutralization_runner.run_trajectory format, e.g. for particle_playback
+def event_trajectory(acid_count, base_count, speed=SPEED, seed=None, max_steps=MAX_STEPS):
+    simulation = EventDrivenSimulation(acid_count, base_count, speed, rng=np.random.default_rng(seed))
+    frames = [(0, *simulation.positions(), np.empty((0, 2)))]
+    step = 0
+    running = acid_count > 0 and base_count > 0
+    while running and step < max_steps:
+        step += 1
+        reacted_before = len(simulation.water)
+        running = simulation.advance_to(step)
+        acid, base, water = simulation.positions()
+        frames.append((step, acid, base, water, water[reacted_before:]))
+    return frames
@@ -0,0 +1,155 @@
+import argparse
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disk_cache import atomic_write, params_hash
+from neutralization import particle_count
+from neutralization_cache import CACHE_ROOT, cached_trajectory
+from neutralization_runner import MAX_STEPS
+from particle_playback import frame_indices
+from particle_view import CAPITALIZED_LABELS, DEFAULT_LABELS, EffectBuffer
+
+# Rendered exports, one file per distinct set of parameters
+CACHE_DIR = os.path.join(CACHE_ROOT, "exports")
+
+# Bump when the rendering changes, so stale cached videos are not reused
+EXPORT_VERSION = 1
+
+# Upper bound on exported frames; longer runs are subsampled evenly
+MAX_FRAMES = 600
+
+# Look of each exportable model, matching its Streamlit animation:
+# title, legend labels, effect lifetime in steps and effect radius by age
+MODELS = {
+    "ti_model": ("Dynamic Neutralization Reaction", DEFAULT_LABELS, 30,
+                 lambda ages: 0.03 * (1 + 0.1 * (ages % 5))),
+    "attraction": ("Neutralization Reaction Simulation with Adjustable Attraction", CAPITALIZED_LABELS, 19,
+                   lambda ages: 0.05 + 0.005 * (ages + 1)),
+}
+
+# Cache file for one export: a hash of every parameter that changes the output
+def cache_path(params, fmt):
+    return os.path.join(CACHE_DIR, params_hash(dict(params, version=EXPORT_VERSION, format=fmt), 20) + "." + fmt)
+
+# Frame data for every exported step: particle positions plus the live reaction
+# effects, replayed through an EffectBuffer here so workers need no shared state
+def _frame_data(trajectory, model, max_frames):
+    _, _, lifetime, effect_radius = MODELS[model]
+    effects = EffectBuffer(lifetime)
+    kept = set(frame_indices(len(trajectory), max_frames).tolist())
+    frames = []
+    for index, (_, acid, base, water, reactions) in enumerate(trajectory):
+        effects.tick()
+        effects.add(reactions)
+        if index in kept:
+            effect_positions, ages = effects.live()
+            frames.append((acid, base, water, effect_positions, effect_radius(ages), effects.alphas(ages)))
+    return frames
+
+# Worker: render a chunk of frames to RGB arrays on one persistent figure
+def _render_chunk(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    from particle_view import ParticleRenderer
+
+    title, labels, frames = args
+    images = []
+    with ParticleRenderer(title, labels) as renderer:
+        for frame in frames:
+            fig = renderer.update(*frame)
+            fig.canvas.draw()
+            images.append(np.asarray(fig.canvas.buffer_rgba())[..., :3].copy())
+    return images
+
+def _write_gif(images, path, fps):
+    from PIL import Image
+
+    first, *rest = [Image.fromarray(image) for image in images]
+    first.save(path, save_all=True, append_images=rest, duration=int(1000 / fps), loop=0)
+
+def _write_mp4(images, path, fps):
+    ffmpeg = shutil.which("ffmpeg")
+    height, width, _ = images[0].shape
+    command = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+        # H.264 needs even dimensions
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path,
+    ]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+        for image in images:
+            process.stdin.write(image.tobytes())
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit code {process.returncode}")
+
+# Render one run of `model` to a GIF or MP4 and return the file path. The run is
+# simulated headless, its frames are rendered in parallel worker processes and the
+# result is cached on disk, so asking for the same export again costs nothing.
+def export_run(model, acid_count, base_count, attraction_strength=0.0, seed=0, fmt="gif", fps=20,
+               max_frames=MAX_FRAMES, max_steps=MAX_STEPS, max_workers=None):
+    if model not in MODELS:
+        raise ValueError(f"Unknown model: {model}")
+    if fmt not in ("gif", "mp4"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "mp4" and shutil.which("ffmpeg") is None:
+        raise RuntimeError("MP4 export needs ffmpeg on the PATH; use --format gif instead")
+
+    params = dict(model=model, acid_count=acid_count, base_count=base_count,
+                  attraction_strength=attraction_strength, seed=seed, fps=fps,
+                  max_frames=max_frames, max_steps=max_steps)
+    path = cache_path(params, fmt)
+    if os.path.exists(path):
+        return path
+
+    trajectory = cached_trajectory(acid_count, base_count, attraction_strength, seed, max_steps)
+    frames = _frame_data(trajectory, model, max_frames)
+
+    title, labels, _, _ = MODELS[model]
+    workers = max_workers or os.cpu_count() or 1
+    chunk = max(1, -(-len(frames) // (workers * 4)))
+    jobs = [(title, labels, frames[lo:lo + chunk]) for lo in range(0, len(frames), chunk)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        images = [image for images in executor.map(_render_chunk, jobs) for image in images]
+
+    # An interrupted export never looks cached
+    writer = _write_gif if fmt == "gif" else _write_mp4
+    return atomic_write(path, lambda partial: writer(images, partial, fps), "." + fmt)
+
+# Export a run for slides, e.g.
+#   python neutralization_export.py ti_model --acid 1.0 --base 0.5 --output neutralization.gif
+#   python neutralization_export.py attraction --acid-count 20 --base-count 20 --attraction 0.02 --format mp4
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a neutralization run as a GIF or MP4")
+    parser.add_argument("model", choices=list(MODELS))
+    parser.add_argument("--acid", type=float, default=1.0, help="acid concentration (mol/L), ti_model")
+    parser.add_argument("--base", type=float, default=1.0, help="base concentration (mol/L), ti_model")
+    parser.add_argument("--acid-volume", type=float, default=1000, help="acid volume (mL), ti_model")
+    parser.add_argument("--base-volume", type=float, default=1000, help="base volume (mL), ti_model")
+    parser.add_argument("--acid-count", type=int, default=10, help="H⁺ particles, attraction model")
+    parser.add_argument("--base-count", type=int, default=10, help="OH⁻ particles, attraction model")
+    parser.add_argument("--attraction", type=float, default=0.01, help="attraction strength, attraction model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["gif", "mp4"], default="gif")
+    parser.add_argument("--fps", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None, help="copy the export here (default: print the cache path)")
+    args = parser.parse_args()
+
+    if args.model == "ti_model":
+        acid_count = particle_count(args.acid, args.acid_volume)
+        base_count = particle_count(args.base, args.base_volume)
+        attraction_strength = 0.0
+    else:
+        acid_count, base_count, attraction_strength = args.acid_count, args.base_count, args.attraction
+
+    path = export_run(args.model, acid_count, base_count, attraction_strength, args.seed,
+                      args.format, args.fps, max_workers=args.workers)
+    if args.output:
+        shutil.copyfile(path, args.output)
+        path = args.output
+    print(path)
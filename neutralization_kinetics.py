@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from neutralization import ACID, BASE, COLLISION_THRESHOLD, PARTICLES_PER_MOLE, ParticleStore, make_rng
+from neutralization_runner import MAX_STEPS
+
+# Chance that one given H⁺/OH⁻ pair is within reaction range in a well-mixed unit
+# box: the area of the reaction disc. This is the per-pair, per-step rate of the
+# particle models in the well-mixed limit; the particle models themselves react
+# more slowly once nearby pairs are used up and the random walk has to bring new
+# ones together.
+ENCOUNTER_PROBABILITY = np.pi * COLLISION_THRESHOLD ** 2
+
+# Mean-field H⁺ + OH⁻ → H₂O kinetics on counts instead of positions, so every step
+# costs the same no matter how many moles are involved.
+#   mode="stochastic": tau-leaping (Gillespie-style), each step every H⁺ of the
+#                      scarcer species reacts with probability 1 - exp(-k·n_other)
+#   mode="rate":       the exact solution of the rate equation d[H⁺]/dt = -k[H⁺][OH⁻]
+# Counts are moles * scale; scale only changes how large (and how smooth) the numbers
+# are, the reaction-progress curve in moles is the same for every scale. A run ends
+# when less than half a particle (at PARTICLES_PER_MOLE) of the scarcer species is left.
+# rate_constant is the per-pair rate at the particle scale.
+# Returns one row per step with the same columns as neutralization_runner.run_simulation.
+def run_kinetics(acid_moles, base_moles, mode="stochastic", scale=PARTICLES_PER_MOLE, seed=None,
+                 max_steps=MAX_STEPS, rate_constant=ENCOUNTER_PROBABILITY):
+    k = rate_constant * PARTICLES_PER_MOLE / scale
+    end_count = 0.5 * scale / PARTICLES_PER_MOLE
+    if mode == "stochastic":
+        return _stochastic_counts(
+            int(acid_moles * scale), int(base_moles * scale), k, end_count, make_rng(seed), max_steps
+        )
+    if mode == "rate":
+        return _rate_counts(acid_moles * scale, base_moles * scale, k, end_count, max_steps)
+    raise ValueError(f"Unknown kinetics mode: {mode}")
+
+# Tau-leaping with binomial draws: the scarcer species reacts against a fixed count of
+# the other during the step, so reactions can never exceed either count
+def _stochastic_counts(acid, base, k, end_count, rng, max_steps):
+    counts = [(0, acid, base, 0)]
+    water = 0
+    step = 0
+    while min(acid, base) >= end_count and acid > 0 and base > 0 and step < max_steps:
+        reacted = int(rng.binomial(min(acid, base), -np.expm1(-k * max(acid, base))))
+        acid -= reacted
+        base -= reacted
+        water += reacted
+        step += 1
+        counts.append((step, acid, base, water))
+    return pd.DataFrame(counts, columns=["step", "acid", "base", "water"])
+
+# Closed-form solution of the second-order rate equation, evaluated at every step at
+# once
+def _rate_counts(acid, base, k, end_count, max_steps):
+    if acid <= 0 or base <= 0:
+        return pd.DataFrame({"step": [0], "acid": [max(acid, 0.0)], "base": [max(base, 0.0)], "water": [0.0]})
+
+    low, high = min(acid, base), max(acid, base)
+    excess = high - low
+    if excess > 0:
+        # low(t) = excess·low0 / (high0·e^(k·excess·t) - low0)
+        end = np.log((excess * low / end_count + low) / high) / (k * excess)
+    else:
+        # low(t) = low0 / (1 + k·low0·t)
+        end = (1 / end_count - 1 / low) / k
+    steps = np.arange(int(min(max(np.ceil(end), 0), max_steps)) + 1)
+
+    if excess > 0:
+        remaining = excess * low / (high * np.exp(k * excess * steps) - low)
+    else:
+        remaining = low / (1 + k * low * steps)
+    water = low - remaining
+    return pd.DataFrame({"step": steps, "acid": acid - water, "base": base - water, "water": water})
+
+# Particle picture for a kinetics run, drawn with at most max_particles particles.
+# Display particles keep their positions between frames and react pairwise as the
+# (scaled-down) counts drop, so the view changes smoothly like the particle models.
+class DownsampledView:
+    def __init__(self, acid_count, base_count, max_particles=400, rng=None):
+        self.rng = make_rng(rng)
+        total = acid_count + base_count
+        self.ratio = min(1.0, max_particles / total) if total > 0 else 1.0
+        self.particles = ParticleStore()
+        self.particles.append(self.rng.random((int(round(acid_count * self.ratio)), 2)), ACID)
+        self.particles.append(self.rng.random((int(round(base_count * self.ratio)), 2)), BASE)
+
+    # Match the display to the current counts and take one random-motion step
+    def update(self, acid_count, base_count):
+        acid_slots = self.particles.indices(ACID)
+        base_slots = self.particles.indices(BASE)
+        reacted = min(
+            len(acid_slots) - int(round(acid_count * self.ratio)),
+            len(base_slots) - int(round(base_count * self.ratio)),
+        )
+        if reacted > 0:
+            acid_slots = self.rng.choice(acid_slots, reacted, replace=False)
+            base_slots = self.rng.choice(base_slots, reacted, replace=False)
+            midpoints = (self.particles.positions[acid_slots] + self.particles.positions[base_slots]) / 2
+            self.particles.react(acid_slots, base_slots, midpoints)
+        self.particles.move(self.rng)
+        return self.particles
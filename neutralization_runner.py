@@ -0,0 +1,107 @@
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from neutralization import initialize_particles, particle_count, step_particles
+
+# Safety cap on the steps of one run, shared by every engine (the event-driven and
+# kinetics ones import it): a lone H⁺/OH⁻ pair doing a random walk can take very
+# long to meet
+MAX_STEPS = 20000
+
+# Run one neutralization to completion without any plotting.
+# Returns one row per step (step 0 is the initial state) with the H⁺, OH⁻ and H₂O counts.
+def run_simulation(acid_count, base_count, attraction_strength=0.0, seed=None,
+                   max_steps=MAX_STEPS, attraction_method="exact"):
+    rng = np.random.default_rng(seed)
+    acid_positions, base_positions, water_positions = initialize_particles(acid_count, base_count, rng)
+
+    counts = [(0, len(acid_positions), len(base_positions), 0)]
+    step = 0
+    while len(acid_positions) > 0 and len(base_positions) > 0 and step < max_steps:
+        acid_positions, base_positions, water_positions, _ = step_particles(
+            acid_positions, base_positions, water_positions, attraction_strength, rng, attraction_method
+        )
+        step += 1
+        counts.append((step, len(acid_positions), len(base_positions), len(water_positions)))
+
+    return pd.DataFrame(counts, columns=["step", "acid", "base", "water"])
+
+# Run one neutralization to completion and keep every particle position.
+# Returns one (step, acid, base, water, reactions) tuple per step, where reactions
+# holds the midpoints of the reactions that happened during that step.
+def run_trajectory(acid_count, base_count, attraction_strength=0.0, seed=None,
+                   max_steps=MAX_STEPS, attraction_method="exact"):
+    rng = np.random.default_rng(seed)
+    acid_positions, base_positions, water_positions = initialize_particles(acid_count, base_count, rng)
+
+    frames = [(0, acid_positions, base_positions, water_positions, np.empty((0, 2)))]
+    step = 0
+    while len(acid_positions) > 0 and len(base_positions) > 0 and step < max_steps:
+        acid_positions, base_positions, water_positions, reactions = step_particles(
+            acid_positions, base_positions, water_positions, attraction_strength, rng, attraction_method
+        )
+        step += 1
+        frames.append((step, acid_positions, base_positions, water_positions, reactions))
+    return frames
+
+# Worker entry point for run_sweep (must be top level to be picklable)
+def _run_case(case):
+    acid_count = particle_count(case["acid_concentration"], case["acid_volume_ml"])
+    base_count = particle_count(case["base_concentration"], case["base_volume_ml"])
+    result = run_simulation(
+        acid_count, base_count, case["attraction_strength"], case["seed"], case["max_steps"]
+    )
+    for key, value in case.items():
+        result[key] = value
+    return result
+
+# Run every combination of the given conditions across a process pool.
+# Each case gets its own independent seed derived from `seed`, so a sweep is
+# reproducible regardless of how the cases are scheduled on the workers.
+def run_sweep(acid_concentrations, base_concentrations, acid_volumes_ml, base_volumes_ml,
+              attraction_strengths=(0.0,), seed=0, max_workers=None, max_steps=MAX_STEPS):
+    grid = list(itertools.product(
+        acid_concentrations, base_concentrations, acid_volumes_ml, base_volumes_ml, attraction_strengths
+    ))
+    seeds = np.random.SeedSequence(seed).generate_state(len(grid)) if grid else []
+    cases = [
+        {
+            "acid_concentration": acid_c,
+            "base_concentration": base_c,
+            "acid_volume_ml": acid_v,
+            "base_volume_ml": base_v,
+            "attraction_strength": strength,
+            "seed": int(case_seed),
+            "max_steps": max_steps,
+        }
+        for (acid_c, base_c, acid_v, base_v, strength), case_seed in zip(grid, seeds)
+    ]
+    if not cases:
+        return pd.DataFrame()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_run_case, cases))
+    return pd.concat(results, ignore_index=True)
+
+# Pre-compute reaction-progress curves for a lesson, e.g.
+#   python neutralization_runner.py --acid 0.5 1.0 2.0 --base 1.0 --output curves.csv
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless neutralization parameter sweep")
+    parser.add_argument("--acid", type=float, nargs="+", default=[1.0], help="acid concentrations (mol/L)")
+    parser.add_argument("--base", type=float, nargs="+", default=[1.0], help="base concentrations (mol/L)")
+    parser.add_argument("--acid-volume", type=float, nargs="+", default=[1000], help="acid volumes (mL)")
+    parser.add_argument("--base-volume", type=float, nargs="+", default=[1000], help="base volumes (mL)")
+    parser.add_argument("--attraction", type=float, nargs="+", default=[0.0], help="attraction strengths")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="neutralization_sweep.csv")
+    args = parser.parse_args()
+
+    sweep = run_sweep(args.acid, args.base, args.acid_volume, args.base_volume,
+                      args.attraction, args.seed, args.workers)
+    sweep.to_csv(args.output, index=False)
+    print(f"{sweep['seed'].nunique()} runs, {len(sweep)} steps -> {args.output}")
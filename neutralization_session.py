@@ -0,0 +1,121 @@
+import time
+
+import streamlit as st
+
+from neutralization import ACID, BASE
+
+# Simulation speed of the animations, independent of how fast frames can be drawn
+STEPS_PER_SECOND = 30
+
+# Display rate the animations aim for; slower rendering just means fewer frames
+TARGET_FPS = 15
+
+# Upper bound on physics steps between two frames, so a slow frame cannot make the run jump
+MAX_STEPS_PER_FRAME = 50
+
+# Shortest time between two redraws of the counts table
+TABLE_INTERVAL = 0.5
+
+# Decouples the physics rate from the display rate. Drawing a frame costs far more
+# than a physics step, so instead of one frame per step the animation runs
+# steps_per_frame steps per frame, sized from the measured frame time so the run
+# advances at steps_per_second however long rendering takes. Frames faster than
+# target_fps are held back, and the counts table is only redrawn when it changed.
+class FramePacer:
+    def __init__(self, steps_per_second=STEPS_PER_SECOND, target_fps=TARGET_FPS,
+                 max_steps_per_frame=MAX_STEPS_PER_FRAME, table_interval=TABLE_INTERVAL):
+        self.steps_per_second = steps_per_second
+        self.frame_seconds = 1 / target_fps
+        self.max_steps_per_frame = max_steps_per_frame
+        self.table_interval = table_interval
+        self.steps_per_frame = 1
+        self.measured = self.frame_seconds  # smoothed duration of a frame
+        self.frame_start = time.perf_counter()
+        self.table_values = None
+        self.table_time = 0.0
+
+    # Call after drawing a frame: waits out the rest of the frame and sizes the next one
+    def wait(self):
+        elapsed = time.perf_counter() - self.frame_start
+        if elapsed < self.frame_seconds:
+            time.sleep(self.frame_seconds - elapsed)
+        self.measured = 0.7 * self.measured + 0.3 * max(elapsed, self.frame_seconds)
+        steps = round(self.steps_per_second * self.measured)
+        self.steps_per_frame = min(max(steps, 1), self.max_steps_per_frame)
+        self.frame_start = time.perf_counter()
+
+    # Whether the table should be redrawn for these values: when they changed and the
+    # last redraw is at least table_interval old, or always when forced
+    def table_due(self, values, force=False):
+        now = time.perf_counter()
+        if not force and (values == self.table_values or now - self.table_time < self.table_interval):
+            return False
+        self.table_values, self.table_time = values, now
+        return True
+
+# One animated neutralization run whose state outlives Streamlit reruns. Kept in
+# st.session_state, so pressing a button or moving a slider continues the run from
+# where it stood instead of starting over. `update` is the script's
+# update_particles(particles, *args, rng, effects); its extra arguments (such as the
+# attraction strength) are passed on every step, so changed sliders apply at once.
+class SimulationSession:
+    def __init__(self, particles, effects, rng, renderer):
+        self.particles = particles
+        self.effects = effects
+        self.rng = rng
+        self.renderer = renderer
+        self.initial_counts = particles.counts()
+        self.step = 0
+        self.total_reacted_pairs = 0
+        self.running = True
+
+    # True once one species is used up
+    @property
+    def done(self):
+        counts = self.particles.counts()
+        return counts[ACID] == 0 or counts[BASE] == 0
+
+    # Advance one step; returns the number of pairs that reacted
+    def advance(self, update, *args):
+        reacted_pairs = update(self.particles, *args, self.rng, self.effects)
+        self.total_reacted_pairs += reacted_pairs
+        self.step += 1
+        return reacted_pairs
+
+    # Generator stepping the run while it is running, yielding after every step, or
+    # after every pacer.steps_per_frame steps when a FramePacer is given. Stops when
+    # paused or finished; a later rerun simply calls it again.
+    def run(self, update, *args, pacer=None):
+        while self.running and not self.done:
+            for _ in range(pacer.steps_per_frame if pacer is not None else 1):
+                self.advance(update, *args)
+                if self.done:
+                    break
+            yield self
+        if self.done:
+            self.running = False
+
+    def close(self):
+        self.renderer.close()
+
+# Start / pause / single-step / resume buttons for the session stored under `key`.
+# `new_session` builds a fresh SimulationSession when the start button is pressed.
+# Returns the current session (None before the first start) and whether a single
+# step was requested on this rerun.
+def session_controls(key, new_session, start_label="반응 시작"):
+    start_col, pause_col, step_col, resume_col = st.columns(4)
+    if start_col.button(start_label):
+        if key in st.session_state:
+            st.session_state[key].close()
+        st.session_state[key] = new_session()
+
+    session = st.session_state.get(key)
+    paused = pause_col.button("일시정지", disabled=session is None)
+    single_step = step_col.button("한 단계", disabled=session is None)
+    resumed = resume_col.button("재개", disabled=session is None)
+    if session is not None:
+        if paused or single_step:
+            session.running = False
+        elif resumed and not session.done:
+            session.running = True
+    return session, single_step
@@ -0,0 +1,94 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from particle_view import DEFAULT_LABELS
+
+# Positions are sent as integers on a RESOLUTION x RESOLUTION grid instead of floats,
+# which keeps the figure JSON small (and lets Plotly pack them as uint16 arrays)
+RESOLUTION = 1000
+
+# Upper bound on animation frames sent to the browser; longer runs are subsampled
+MAX_FRAMES = 300
+
+# Quantize an (N, 2) array of positions in [0, 1] to grid coordinates
+def _quantize(positions, resolution):
+    positions = np.asarray(positions).reshape(-1, 2)
+    return np.rint(positions * resolution).astype(np.uint16)
+
+# Indices of the frames to keep: evenly spaced, always including the first and last
+def frame_indices(n_frames, max_frames):
+    if n_frames <= max_frames:
+        return np.arange(n_frames)
+    return np.unique(np.linspace(0, n_frames - 1, max_frames).round().astype(int))
+
+# Scatter traces for one frame. Only particles still present are included, so
+# reacted H⁺/OH⁻ cost nothing in later frames.
+def _frame_traces(acid, base, water, reactions, labels, resolution):
+    traces = []
+    for positions, color, label, size in (
+        (acid, "red", labels[0], 9),
+        (base, "blue", labels[1], 9),
+        (water, "gold", labels[2], 9),
+        (reactions, "green", "반응", 22),
+    ):
+        points = _quantize(positions, resolution)
+        traces.append(go.Scatter(
+            x=points[:, 0], y=points[:, 1], mode="markers", name=label,
+            marker=dict(color=color, size=size, opacity=0.5 if color == "green" else 1.0),
+            hoverinfo="skip",
+        ))
+    return traces
+
+# Pack a trajectory from neutralization_runner.run_trajectory into one animated
+# Plotly figure. Playback, pause and the step slider run entirely in the browser;
+# the server only sends the figure once.
+def playback_figure(trajectory, title, labels=DEFAULT_LABELS, max_frames=MAX_FRAMES,
+                    resolution=RESOLUTION, frame_duration=50):
+    kept = frame_indices(len(trajectory), max_frames)
+
+    frames = []
+    previous = -1
+    for index in kept:
+        step, acid, base, water, _ = trajectory[index]
+        # Show every reaction since the previous kept frame, so subsampling never hides one
+        reactions = np.vstack([trajectory[k][4] for k in range(previous + 1, index + 1)])
+        previous = index
+        frames.append(go.Frame(
+            name=str(step),
+            data=_frame_traces(acid, base, water, reactions, labels, resolution),
+            layout=go.Layout(title_text=f"{title} — step {step}: "
+                                        f"H⁺ {len(acid)}, OH⁻ {len(base)}, H₂O {len(water)}"),
+        ))
+
+    axis = dict(range=[0, resolution], visible=False, fixedrange=True)
+    play_args = dict(frame=dict(duration=frame_duration, redraw=False),
+                     transition=dict(duration=0), fromcurrent=True, mode="immediate")
+    pause_args = dict(frame=dict(duration=0, redraw=False), transition=dict(duration=0), mode="immediate")
+
+    fig = go.Figure(data=frames[0].data, frames=frames)
+    fig.update_layout(
+        title_text=frames[0].layout.title.text,
+        xaxis=axis,
+        yaxis=dict(axis, scaleanchor="x"),
+        width=600,
+        height=650,
+        legend=dict(orientation="h", y=-0.05),
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0,
+            y=1.08,
+            buttons=[
+                dict(label="▶ 재생", method="animate", args=[None, play_args]),
+                dict(label="⏸ 일시정지", method="animate", args=[[None], pause_args]),
+            ],
+        )],
+        sliders=[dict(
+            currentvalue=dict(prefix="step "),
+            steps=[
+                dict(label=frame.name, method="animate", args=[[frame.name], pause_args])
+                for frame in frames
+            ],
+        )],
+    )
+    return fig
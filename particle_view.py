@@ -0,0 +1,104 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+# Legend labels: ti_model.py uses the lower-case names, the other models capitalise them
+DEFAULT_LABELS = ("H⁺ (acid)", "OH⁻ (base)", "H₂O (water)")
+CAPITALIZED_LABELS = ("H⁺ (Acid)", "OH⁻ (Base)", "H₂O (Water)")
+
+# Colour of the reaction-effect pulses and their opacity when they first appear
+EFFECT_COLOR = to_rgba('green')
+EFFECT_ALPHA = 0.5
+
+# Most reaction effects alive at once; a burst beyond this overwrites the oldest
+MAX_EFFECTS = 256
+
+# Fixed-size ring buffer of reaction-effect pulses with a per-effect age in steps.
+# New effects overwrite the oldest slot once the buffer is full and every effect
+# expires after `lifetime` steps, so the number drawn per frame is bounded.
+class EffectBuffer:
+    def __init__(self, lifetime, capacity=MAX_EFFECTS):
+        self.lifetime = lifetime
+        self.positions = np.zeros((capacity, 2))
+        self.ages = np.full(capacity, lifetime)  # age >= lifetime marks a free slot
+        self.head = 0  # next slot to write, always the oldest one
+
+    @property
+    def capacity(self):
+        return len(self.ages)
+
+    # Start a new pulse (age 0) at every given position
+    def add(self, positions):
+        positions = np.asarray(positions).reshape(-1, 2)[-self.capacity:]
+        slots = (self.head + np.arange(len(positions))) % self.capacity
+        self.positions[slots] = positions
+        self.ages[slots] = 0
+        self.head = (self.head + len(positions)) % self.capacity
+
+    # Age every pulse by one step; pulses reaching lifetime disappear
+    def tick(self):
+        np.minimum(self.ages + 1, self.lifetime, out=self.ages)
+
+    # Positions and ages of the live pulses
+    def live(self):
+        alive = self.ages < self.lifetime
+        return self.positions[alive], self.ages[alive]
+
+    # Opacity of each live pulse, fading out linearly over its lifetime
+    def alphas(self, ages):
+        return EFFECT_ALPHA * (1 - ages / self.lifetime)
+
+# Figure for the particle animations that is built once and then only updated.
+# Each frame just moves the scatter offsets and restyles the effect markers, so a long
+# run keeps one figure alive instead of creating (and leaking) one per step. The
+# figure is not registered with pyplot, so a renderer left in st.session_state by a
+# closed browser tab is freed with the session. Use as a context manager, or call
+# close() when the run ends.
+class ParticleRenderer:
+    def __init__(self, title, labels=DEFAULT_LABELS, figsize=(6, 6)):
+        self.fig = Figure(figsize=figsize)
+        FigureCanvasAgg(self.fig)  # for exports that draw the canvas directly
+        self.ax = self.fig.subplots()
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+
+        empty = np.empty((0, 2))
+        self.acid = self.ax.scatter(empty[:, 0], empty[:, 1], color='red', label=labels[0], s=50)
+        self.base = self.ax.scatter(empty[:, 0], empty[:, 1], color='blue', label=labels[1], s=50)
+        self.water = self.ax.scatter(empty[:, 0], empty[:, 1], color='yellow', label=labels[2], s=50)
+        # All reaction effects share one collection; sizes and opacities are set per frame
+        self.effects = self.ax.scatter(empty[:, 0], empty[:, 1], color=EFFECT_COLOR, s=[], linewidths=0)
+
+        # A fixed legend position avoids the "best" placement search on every draw
+        self.ax.legend(loc="upper right")
+        self.ax.set_title(title)
+        self.ax.axis("off")
+
+        # Marker sizes are in points²; convert data-unit radii with the fixed axes width
+        self._points_per_unit = self.ax.get_position().width * self.fig.get_figwidth() * 72
+
+    # Move every artist to the new state and return the figure to display.
+    # effect_radii are in data units; effect_alphas defaults to EFFECT_ALPHA for all.
+    def update(self, acid_positions, base_positions, water_positions, effect_positions, effect_radii,
+               effect_alphas=None):
+        self.acid.set_offsets(np.asarray(acid_positions).reshape(-1, 2))
+        self.base.set_offsets(np.asarray(base_positions).reshape(-1, 2))
+        self.water.set_offsets(np.asarray(water_positions).reshape(-1, 2))
+        effect_positions = np.asarray(effect_positions).reshape(-1, 2)
+        colors = np.tile(EFFECT_COLOR, (len(effect_positions), 1))
+        colors[:, 3] = EFFECT_ALPHA if effect_alphas is None else effect_alphas
+        self.effects.set_offsets(effect_positions)
+        self.effects.set_sizes((2 * np.asarray(effect_radii) * self._points_per_unit) ** 2)
+        self.effects.set_facecolors(colors)
+        return self.fig
+
+    # Drop the artists; the figure itself goes with the renderer
+    def close(self):
+        self.fig.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
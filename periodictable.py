@@ -1,13 +1,21 @@
+import io
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+from matplotlib.collections import PathCollection
+from matplotlib.colors import Normalize, to_rgba
+from matplotlib.figure import Figure
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, IdentityTransform
+
+from element_dataset import load_dataset
 
-# 데이터 로드
-file_path = 'elementdatavalues.csv'  # 데이터 파일 경로
+# 데이터 로드: 모든 앱이 함께 쓰는 표준 원소 데이터셋(element_dataset, 반지름 pm, 이온화 에너지 kJ/mol)
 try:
-    element_data = pd.read_csv(file_path)
+    element_data = load_dataset()
 except FileNotFoundError:
     st.error("데이터 파일을 찾을 수 없습니다. 파일 경로를 확인하세요.")
     st.stop()
@@ -40,42 +48,55 @@ if not valid_properties:
 # 사용자 선택: 시각화할 성질
 selected_property = st.selectbox("시각화할 성질을 선택하세요:", options=valid_properties.keys(), format_func=lambda x: valid_properties[x])
 
-# 데이터 전처리: 범위 계산 (NaN 값 제외)
-property_min = element_data[selected_property].dropna().min()
-property_max = element_data[selected_property].dropna().max()
-
 # Matplotlib로 주기율표 시각화
+# 색상표와 정규화는 한 번만 만들고, 모든 원소를 점 하나의 scatter와 기호 경로 묶음(PathCollection)
+# 하나로 그린다. 완성된 그림(PNG)은 선택한 성질별로 저장해 두고 다시 그리지 않는다.
+@st.cache_data
+def periodic_table_png(element_data, selected_property, title):
+    placed = element_data.dropna(subset=["Graph.Period", "Graph.Group"])
+    group = placed["Graph.Group"].to_numpy(dtype=float)
+    period = placed["Graph.Period"].to_numpy(dtype=float)
+    values = placed[selected_property].to_numpy(dtype=float)
+
+    # 데이터 점 색상 매핑 (값이 없는 원소는 회색, 범위는 NaN 값 제외)
+    cmap = sns.color_palette("coolwarm", as_cmap=True)
+    present = ~np.isnan(values)
+    colors = np.tile(to_rgba("gray"), (len(values), 1))
+    if present.any():
+        norm = Normalize(values[present].min(), values[present].max())
+        colors[present] = cmap(norm(values[present]))
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.scatter(group, period, s=300, c=colors, edgecolors="black", alpha=0.8)
+
+    # 원소 기호: 글자 모양 경로를 가운데 맞춰 한 번에 그린다 (크기 단위는 포인트, scatter 마커와 같은 방식)
+    symbols = []
+    for symbol in placed["Symbol"]:
+        path = TextPath((0, 0), symbol, size=10)
+        extents = path.get_extents()
+        symbols.append(path.transformed(Affine2D().translate(-(extents.x0 + extents.x1) / 2, -(extents.y0 + extents.y1) / 2)))
+    labels = PathCollection(symbols, sizes=[1.0], offsets=np.column_stack([group, period]),
+                            offset_transform=ax.transData, facecolors="white", edgecolors="none")
+    labels.set_transform(IdentityTransform())
+    ax.add_collection(labels, autolim=False)
+
+    ax.set_xlim(0.5, 18.5)
+    ax.set_ylim(0.5, 7.5)
+    ax.set_xticks(range(1, 19))
+    ax.set_yticks(range(1, 8))
+    ax.set_xlabel("Group (족)")
+    ax.set_ylabel("Period (주기)")
+    ax.set_title(f"주기율표 ({title})", fontsize=16)
+    ax.grid(True, linestyle="--", alpha=0.5)
+
+    image = io.BytesIO()
+    # st.pyplot과 같은 저장 설정
+    fig.savefig(image, format="png", dpi=200, bbox_inches="tight")
+    return image.getvalue()
+
 st.subheader("주기율표 시각화")
-fig, ax = plt.subplots(figsize=(12, 6))
-
-# Plotting 원소별 데이터
-for _, row in element_data.iterrows():
-    try:
-        if pd.isna(row['Graph.Period']) or pd.isna(row['Graph.Group']):
-            continue
-        period = int(row['Graph.Period'])
-        group = int(row['Graph.Group'])
-
-        # 데이터 점 색상 매핑
-        value = row[selected_property]
-        color = sns.color_palette("coolwarm", as_cmap=True)((value - property_min) / (property_max - property_min)) if not pd.isna(value) else "gray"
-
-        ax.scatter(group, period, s=300, color=color, edgecolors="black", alpha=0.8)
-        ax.text(group, period, row["Symbol"], ha="center", va="center", fontsize=10, color="white")
-    except Exception as e:
-        st.warning(f"데이터 오류: {row['Symbol']} - {e}")
-
-ax.set_xlim(0.5, 18.5)
-ax.set_ylim(0.5, 7.5)
-ax.set_xticks(range(1, 19))
-ax.set_yticks(range(1, 8))
-ax.set_xlabel("Group (족)")
-ax.set_ylabel("Period (주기)")
-ax.set_title(f"주기율표 ({valid_properties[selected_property]})", fontsize=16)
-ax.grid(True, linestyle="--", alpha=0.5)
-
-# Streamlit에 Matplotlib 그래프 표시
-st.pyplot(fig)
+st.image(periodic_table_png(element_data, selected_property, valid_properties[selected_property]))
 
 # Plotly로 상호작용 그래프 생성
 st.subheader("원소 특성 상호작용 그래프")
@@ -103,14 +124,14 @@ selected_row = element_data[element_data["Symbol"] == selected_symbol].iloc[0]
 
 # 선택된 원소 데이터 출력
 value_display = selected_row[selected_property]
-value_display = "데이터 없음" if pd.isna(value_display) else value_display
+value_display = "데이터 없음" if pd.isna(value_display) else round(float(value_display), 2)
 
 st.markdown(f"""
 **선택한 원소 정보**
 - **이름**: {selected_row['Name']}
 - **기호**: {selected_row['Symbol']}
 - **원자번호**: {selected_row['Atomic_Number']}
-- **족(Group)**: {selected_row['Graph.Group']}
-- **주기(Period)**: {selected_row['Graph.Period']}
+- **족(Group)**: {"-" if pd.isna(selected_row['Group']) else int(selected_row['Group'])}
+- **주기(Period)**: {selected_row['Period']}
 - **{valid_properties[selected_property]}**: {value_display}
 """)
@@ -0,0 +1,18 @@
+import pytest
+
+from buffer_grid import ERROR_BOUND, build_grid, load_grid, lookup_pH, max_error
+from buffer_model import titrate
+
+# The interpolated pH tables stay within ERROR_BOUND of the exact charge balance
+# over the whole slider range
+@pytest.mark.parametrize("additive", ["HCl", "NaOH", "NaA"])
+def test_grid_within_error_bound(additive):
+    assert max_error(build_grid(additive), additive, samples=20_000) <= ERROR_BOUND
+
+# The scalar fast path and the vectorized lookup read the same value
+def test_scalar_lookup_matches_vectorized():
+    grid = load_grid("HCl")
+    scalar = lookup_pH(grid, 42.5, 17.25, "HCl", 30.0)
+    vectorized = lookup_pH(grid, [42.5], [17.25], "HCl", [30.0])[0]
+    assert scalar == pytest.approx(vectorized, abs=1e-9)
+    assert scalar == pytest.approx(float(titrate(42.5, 17.25, "HCl", 30.0)[0]), abs=ERROR_BOUND)
@@ -0,0 +1,53 @@
+import os
+import threading
+
+import pytest
+
+from disk_cache import atomic_write
+
+# Writers of the same entry that overlap (here both stop halfway through their
+# write) each get their own partial file, so neither removes or publishes the
+# other's half-written one
+def test_concurrent_writers_use_own_partial(tmp_path):
+    path = str(tmp_path / "entry.bin")
+    data = os.urandom(1 << 20)
+    halfway = threading.Barrier(2, timeout=10)
+    errors, partials = [], []
+
+    def write(partial):
+        partials.append(partial)
+        with open(partial, "wb") as output:
+            output.write(data[:len(data) // 2])
+            output.flush()
+            halfway.wait()
+            output.write(data[len(data) // 2:])
+
+    def run():
+        try:
+            atomic_write(path, write)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(partials)) == 2
+    with open(path, "rb") as published:
+        assert published.read() == data
+    assert os.listdir(tmp_path) == ["entry.bin"]
+
+# A failed write removes its own partial entry and publishes nothing
+def test_failed_write_leaves_nothing(tmp_path):
+    path = str(tmp_path / "table")
+
+    def write(partial):
+        open(os.path.join(partial, "numbers.npy"), "w").close()
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        atomic_write(path, write, directory=True)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,20 @@
+import os
+
+import numpy as np
+
+from neutralization_cache import TrajectoryCache, cached_trajectory
+
+# A truncated cache file is dropped and the run simulated and cached again,
+# giving the same trajectory as before
+def test_truncated_entry_is_recomputed(tmp_path):
+    cache = TrajectoryCache(str(tmp_path))
+    expected = cached_trajectory(10, 10, seed=7, max_steps=50, cache=cache)
+    (path,) = [entry.path for entry in os.scandir(tmp_path)]
+    with open(path, "r+b") as entry:
+        entry.truncate(os.path.getsize(path) // 2)
+
+    trajectory = cached_trajectory(10, 10, seed=7, max_steps=50, cache=cache)
+    assert [frame[0] for frame in trajectory] == [frame[0] for frame in expected]
+    assert all((a == b).all() for frame, other in zip(trajectory, expected) for a, b in zip(frame[1:], other[1:]))
+    with np.load(path) as data:
+        assert len(data["steps"]) == len(expected)
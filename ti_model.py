@@ -1,80 +1,66 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import time
+
+from neutralization import ACID, BASE, COLLISION_THRESHOLD, WATER, ParticleStore, find_reactions, make_rng, particle_count
+from neutralization_cache import cached_trajectory
+from neutralization_kinetics import DownsampledView, run_kinetics
+from neutralization_session import FramePacer, SimulationSession, session_controls
+from particle_playback import playback_figure
+from particle_view import EffectBuffer, ParticleRenderer
 
 # Initialize particles
-def initialize_particles(acid_moles, base_moles):
-    acid_positions = np.random.rand(int(acid_moles * 10), 2)
-    base_positions = np.random.rand(int(base_moles * 10), 2)
-    water_positions = np.empty((0, 2))  # Initially no water molecules
-    return acid_positions, base_positions, water_positions
-
-# Update particle positions and simulate reaction
-def update_particles(acid_positions, base_positions, water_positions, reaction_effects):
-    reacted_pairs = 0
-    new_water_positions = []
-    new_effect_positions = []
-
-    # Check for collisions (simplified proximity check)
-    i = 0
-    while i < len(acid_positions):
-        j = 0
-        while j < len(base_positions):
-            if np.linalg.norm(acid_positions[i] - base_positions[j]) < 0.05:  # Collision threshold
-                new_water_positions.append((acid_positions[i] + base_positions[j]) / 2)
-                new_effect_positions.append((acid_positions[i] + base_positions[j]) / 2)  # Effect position
-                acid_positions = np.delete(acid_positions, i, axis=0)
-                base_positions = np.delete(base_positions, j, axis=0)
-                reacted_pairs += 1
-                break
-            else:
-                j += 1
-        else:
-            i += 1
-
-    # Add water positions if any reactions occurred
-    if new_water_positions:
-        new_water_positions = np.array(new_water_positions)  # Convert list to array
-        water_positions = np.vstack([water_positions, new_water_positions])
-
-    # Add reaction effects
-    if new_effect_positions:
-        new_effect_positions = np.array(new_effect_positions)
-        reaction_effects = np.vstack([reaction_effects, new_effect_positions])
-
-    # Random motion for remaining particles
-    acid_positions += np.random.uniform(-0.03, 0.03, acid_positions.shape)  # Increased speed by 50%
-    base_positions += np.random.uniform(-0.03, 0.03, base_positions.shape)
-    water_positions += np.random.uniform(-0.015, 0.015, water_positions.shape)
-
-    # Keep particles within bounds
-    acid_positions = np.clip(acid_positions, 0, 1)
-    base_positions = np.clip(base_positions, 0, 1)
-    water_positions = np.clip(water_positions, 0, 1)
-
-    return acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects
-
-# Plot the particles
-def plot_particles(acid_positions, base_positions, water_positions, reaction_effects, step):
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-
-    ax.scatter(acid_positions[:, 0], acid_positions[:, 1], color='red', label="H⁺ (acid)", s=50)  # Red for H⁺
-    ax.scatter(base_positions[:, 0], base_positions[:, 1], color='blue', label="OH⁻ (base)", s=50)  # Blue for OH⁻
-    ax.scatter(water_positions[:, 0], water_positions[:, 1], color='yellow', label="H₂O (water)", s=50)  # Yellow for water
-
-    # Add reaction effect (pulse effect)
-    for effect in reaction_effects:
-        circle = plt.Circle(effect, 0.03 * (1 + 0.1 * (step % 5)), color='green', alpha=0.5)
-        ax.add_patch(circle)
-
-    ax.legend()
-    ax.set_title("Dynamic Neutralization Reaction")
-    ax.axis("off")
-    return fig
+def initialize_particles(acid_count, base_count, rng=None):
+    rng = make_rng(rng)
+    particles = ParticleStore()
+    particles.append(rng.random((acid_count, 2)), ACID)
+    particles.append(rng.random((base_count, 2)), BASE)
+    return particles  # Initially no water molecules
+
+# Reaction effects last 30 steps (about a second at the default animation speed)
+EFFECT_LIFETIME = 30
+
+# Update particle positions and simulate reaction (in place)
+def update_particles(particles, rng=None, effects=None):
+    # Check for collisions (cell-list neighbour search, one-to-one matching)
+    acid_slots = particles.indices(ACID)
+    base_slots = particles.indices(BASE)
+    acid_idx, base_idx = find_reactions(particles.positions[acid_slots], particles.positions[base_slots], COLLISION_THRESHOLD)
+    reacted_pairs = len(acid_idx)
+    acid_slots, base_slots = acid_slots[acid_idx], base_slots[base_idx]
+    new_water_positions = (particles.positions[acid_slots] + particles.positions[base_slots]) / 2
+
+    # Reacted H⁺ become water, reacted OH⁻ are retired
+    particles.react(acid_slots, base_slots, new_water_positions)
+
+    # Age existing reaction effects and add new ones
+    if effects is not None:
+        effects.tick()
+        effects.add(new_water_positions)  # Effect position
+
+    # Random motion for remaining particles, kept within bounds
+    particles.move(rng)
+
+    return reacted_pairs
+
+# Plot the particles on the persistent figure
+def plot_particles(renderer, particles, effects):
+    # Add reaction effect (pulse effect, fading with age)
+    effect_positions, effect_ages = effects.live()
+    effect_radii = 0.03 * (1 + 0.1 * (effect_ages % 5))
+    return renderer.update(
+        particles.positions_of(ACID), particles.positions_of(BASE), particles.positions_of(WATER),
+        effect_positions, effect_radii, effects.alphas(effect_ages),
+    )
+
+# H⁺/OH⁻/H₂O count table shown under every display mode
+def results_table(initial_acid, initial_base, remaining_acid, remaining_base, water):
+    return pd.DataFrame({
+        "이온 종류": ["H⁺ (산)", "OH⁻ (염기)", "H₂O (물)"],
+        "초기 개수": [initial_acid, initial_base, 0],
+        "반응한 개수": [initial_acid - remaining_acid, initial_base - remaining_base, water],
+        "남은 개수": [remaining_acid, remaining_base, water],
+    })
 
 # Streamlit App
 st.title("중화 반응 시뮬레이션")
@@ -85,56 +71,122 @@ acid_concentration = st.sidebar.slider("산 농도 (mol/L)", 0.1, 2.0, 1.0, 0.1)
 base_concentration = st.sidebar.slider("염기 농도 (mol/L)", 0.1, 2.0, 1.0, 0.1)
 acid_volume_ml = st.sidebar.slider("산 용액 부피 (mL)", 0, 2000, 1000, 10)  # Minimum 0mL, step 10mL
 base_volume_ml = st.sidebar.slider("염기 용액 부피 (mL)", 0, 2000, 1000, 10)  # Minimum 0mL, step 10mL
-
-if st.button("반응 시뮬레이션 시작"):
-    with st.spinner("시뮬레이션 실행 중..."):
-        # Convert mL to L for calculations
-        acid_volume = acid_volume_ml / 1000.0
-        base_volume = base_volume_ml / 1000.0
-
-        # Calculate initial moles
-        acid_moles = acid_concentration * acid_volume
-        base_moles = base_concentration * base_volume
-
-        # Initialize particles
-        acid_positions, base_positions, water_positions = initialize_particles(acid_moles, base_moles)
-        reaction_effects = np.empty((0, 2))  # Track effect positions
-
-        total_reacted_pairs = 0  # Track total reactions
+# Same seed, same run. The default is a fixed seed so that students who keep the
+# default conditions share one cached "브라우저 재생" run
+seed = st.sidebar.number_input("난수 시드 (0 = 무작위)", 0, 2**32 - 1, 1, 1)
+
+# "브라우저 재생" computes the whole run once and plays it back client-side, and is
+# the only mode served from the on-disk run cache (the live animation is stepped
+# interactively, so it is always simulated); "반응 속도식" follows only the ion
+# counts, so any amount runs at the same speed
+display_mode = st.sidebar.radio("표시 방식", ["실시간 애니메이션", "브라우저 재생", "반응 속도식"])
+if display_mode == "실시간 애니메이션":
+    st.sidebar.caption("실시간 애니메이션은 매번 새로 계산합니다. 같은 조건의 결과를 저장해 두고 다시 보려면 '브라우저 재생'을 선택하세요.")
+elif display_mode == "브라우저 재생":
+    st.sidebar.caption("같은 조건과 시드의 실행은 저장된 결과를 다시 재생합니다 (시드 0은 매번 새로 계산).")
+    # Straight-line flights with exact encounter times instead of the random walk
+    event_driven = st.sidebar.checkbox("이벤트 기반 엔진 (충돌 예측)")
+elif display_mode == "반응 속도식":
+    kinetics_mode = st.sidebar.radio("속도식 종류", ["stochastic", "rate"],
+                                     format_func={"stochastic": "확률적 (Gillespie)", "rate": "평균장 속도식"}.get)
+    particles_per_mole = st.sidebar.select_slider("mol당 입자 수", [10, 1_000, 1_000_000, 1_000_000_000], 10)
+
+# Convert mL to L for calculations
+acid_volume = acid_volume_ml / 1000.0
+base_volume = base_volume_ml / 1000.0
+
+# Calculate initial moles
+acid_moles = acid_concentration * acid_volume
+base_moles = base_concentration * base_volume
+
+# Particles drawn for each solution (neutralization.PARTICLES_PER_MOLE per mole)
+acid_count = particle_count(acid_concentration, acid_volume_ml)
+base_count = particle_count(base_concentration, base_volume_ml)
+
+if display_mode == "실시간 애니메이션":
+    # The run lives in st.session_state, so it can be paused, stepped and resumed
+    def new_session():
+        rng = make_rng(seed or None)
+        renderer = ParticleRenderer("Dynamic Neutralization Reaction")
+        return SimulationSession(initialize_particles(acid_count, base_count, rng), EffectBuffer(EFFECT_LIFETIME), rng, renderer)
+
+    session, single_step = session_controls("ti_model", new_session, "반응 시뮬레이션 시작")
+    if session is not None:
         animation_placeholder = st.empty()
         table_placeholder = st.empty()
+        initial_counts = session.initial_counts
+        pacer = FramePacer()
 
-        # Run the animation
-        step = 0
-        initial_acid_ions = int(acid_moles * 10)
-        initial_base_ions = int(base_moles * 10)
-
-        while len(acid_positions) > 0 and len(base_positions) > 0:  # Continue until all reactions complete
-            acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects = update_particles(
-                acid_positions, base_positions, water_positions, reaction_effects
-            )
-            total_reacted_pairs += reacted_pairs
-            fig = plot_particles(acid_positions, base_positions, water_positions, reaction_effects, step)
-
-            # Remove effects after 3 seconds
-            if step > 30:
-                reaction_effects = reaction_effects[1:]  # Remove oldest effect
+        def show(force_table=False):
+            fig = plot_particles(session.renderer, session.particles, session.effects)
 
             # Real-time table update
-            reacted_acid_ions = initial_acid_ions - len(acid_positions)
-            reacted_base_ions = initial_base_ions - len(base_positions)
-            total_water_molecules = len(water_positions)
-
-            results = {
-                "이온 종류": ["H⁺ (산)", "OH⁻ (염기)", "H₂O (물)"],
-                "초기 개수": [initial_acid_ions, initial_base_ions, 0],
-                "반응한 개수": [reacted_acid_ions, reacted_base_ions, total_water_molecules],
-                "남은 개수": [len(acid_positions), len(base_positions), total_water_molecules],
-            }
-            table_placeholder.table(pd.DataFrame(results))
+            counts = session.particles.counts()
+            if pacer.table_due(tuple(counts), force_table or session.done):
+                table_placeholder.table(results_table(
+                    initial_counts[ACID], initial_counts[BASE], counts[ACID], counts[BASE], counts[WATER]))
 
             animation_placeholder.pyplot(fig)
-            step += 1
-            time.sleep(0.001)  # 1/1000 second update time
 
-        st.success("시뮬레이션 완료!")
\ No newline at end of file
+        if single_step and not session.done:
+            session.advance(update_particles)
+        show(force_table=True)
+
+        # Run the animation, several steps per frame, until paused or all reactions complete
+        for _ in session.run(update_particles, pacer=pacer):
+            show()
+            pacer.wait()
+
+        if session.done:
+            st.success("시뮬레이션 완료!")
+elif st.button("반응 시뮬레이션 시작"):
+    with st.spinner("시뮬레이션 실행 중..."):
+        if display_mode == "브라우저 재생":
+            initial_acid_ions, initial_base_ions = acid_count, base_count
+            # Replayed from the on-disk cache when these conditions ran with the same
+            # seed before; seed 0 (무작위) simulates a new run every time
+            trajectory = cached_trajectory(
+                initial_acid_ions, initial_base_ions, seed=seed or None,
+                engine="event_driven" if event_driven else "random_walk",
+            )
+            st.plotly_chart(playback_figure(trajectory, "Dynamic Neutralization Reaction"))
+
+            _, acid_positions, base_positions, water_positions, _ = trajectory[-1]
+            st.table(results_table(
+                initial_acid_ions, initial_base_ions, len(acid_positions), len(base_positions), len(water_positions)))
+        elif display_mode == "반응 속도식":
+            counts = run_kinetics(acid_moles, base_moles, kinetics_mode, particles_per_mole, seed or None)
+            initial_acid_ions = int(counts["acid"].iloc[0])
+            initial_base_ions = int(counts["base"].iloc[0])
+
+            animation_placeholder = st.empty()
+            table_placeholder = st.empty()
+
+            # Down-sampled particle picture driven by the counts. Paced like the live
+            # animation: one frame every pacer.steps_per_frame rows, the last row always shown
+            view = DownsampledView(initial_acid_ions, initial_base_ions, rng=seed or None)
+            pacer = FramePacer()
+            rows = list(counts.itertuples())
+            index = 0
+            with ParticleRenderer("Neutralization Kinetics (down-sampled view)") as renderer:
+                while True:
+                    row = rows[index]
+                    last = index == len(rows) - 1
+                    particles = view.update(row.acid, row.base)
+                    fig = renderer.update(
+                        particles.positions_of(ACID), particles.positions_of(BASE), particles.positions_of(WATER),
+                        np.empty((0, 2)), np.empty(0),
+                    )
+
+                    remaining_acid, remaining_base, total_water_molecules = round(row.acid), round(row.base), round(row.water)
+                    if pacer.table_due((remaining_acid, remaining_base, total_water_molecules), force=last):
+                        table_placeholder.table(results_table(
+                            initial_acid_ions, initial_base_ions, remaining_acid, remaining_base, total_water_molecules))
+
+                    animation_placeholder.pyplot(fig)
+                    if last:
+                        break
+                    pacer.wait()
+                    index = min(index + pacer.steps_per_frame, len(rows) - 1)
+
+        st.success("시뮬레이션 완료!")
@@ -0,0 +1,68 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from element_dataset import SUBSHELL_L, SUBSHELL_N, SUBSHELLS, load_dataset, occupancy_matrix
+
+# Slater groups in order: [1s] [2s,2p] [3s,3p] [3d] [4s,4p] [4d] [4f] [5s,5p] ...
+# An s and p subshell of the same n share a group; every d and f subshell is its own.
+_GROUP_KEY = [(n, 0 if l <= 1 else l) for n, l in zip(SUBSHELL_N, SUBSHELL_L)]
+SLATER_GROUP = np.array([sorted(set(_GROUP_KEY)).index(key) for key in _GROUP_KEY])
+
+# Slater's rules as a matrix: SHIELDING[i, j] is how much one electron in subshell i
+# screens an electron in subshell j.
+#   same group                          0.35 (0.30 within 1s)
+#   groups further out                  0
+#   s/p target: shell n-1               0.85, shells n-2 and below 1.00
+#   d/f target: every group further in  1.00
+def _shielding_matrix():
+    same = SLATER_GROUP[:, np.newaxis] == SLATER_GROUP
+    inner = SLATER_GROUP[:, np.newaxis] < SLATER_GROUP
+    sp_target = SUBSHELL_L <= 1
+    next_shell_in = SUBSHELL_N[:, np.newaxis] == SUBSHELL_N - 1
+    inner_factor = np.where(sp_target & next_shell_in, 0.85, 1.0)
+    same_factor = np.where(np.array(SUBSHELLS) == "1s", 0.30, 0.35)
+    return np.where(same, same_factor, np.where(inner, inner_factor, 0.0))
+
+SHIELDING = _shielding_matrix()
+
+# Effective nuclear charge Z - S seen by one electron of every subshell of every
+# element, from an occupancy matrix (elements x SUBSHELLS): one matrix product for
+# the whole table. The electron does not screen itself, so its own share is added
+# back. Empty subshells are NaN.
+def subshell_zeff(atomic_number, shells):
+    shells = np.asarray(shells, dtype=float)
+    zeff = np.asarray(atomic_number, dtype=float)[:, np.newaxis] - shells @ SHIELDING + np.diag(SHIELDING)
+    return np.where(shells > 0, zeff, np.nan)
+
+# Zeff of the outermost electron: the occupied subshell in the outermost Slater
+# group (4s for Cu, 4d for Pd, 6s for La)
+def outermost_zeff(atomic_number, shells, zeff=None):
+    if zeff is None:
+        zeff = subshell_zeff(atomic_number, shells)
+    outermost = np.where(np.asarray(shells) > 0, SLATER_GROUP * len(SUBSHELLS) + np.arange(len(SUBSHELLS)), -1).argmax(axis=1)
+    return zeff[np.arange(len(zeff)), outermost]
+
+# Zeff table of a dataset (element_dataset.load_dataset), from its precomputed
+# occupancy matrix: one column per subshell (NaN where empty) and "Outermost",
+# indexed like the dataset
+def zeff_table(dataset):
+    shells = occupancy_matrix(dataset)
+    zeff = subshell_zeff(dataset["Atomic_Number"], shells)
+    table = pd.DataFrame(zeff, columns=list(SUBSHELLS), index=dataset.index)
+    table["Outermost"] = outermost_zeff(dataset["Atomic_Number"], shells, zeff)
+    return table
+
+# Print the Slater Zeff of every occupied subshell, e.g.
+#   python zeff.py
+#   python zeff.py Na Cl Fe
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Slater's-rules effective nuclear charge of each subshell")
+    parser.add_argument("symbols", nargs="*", help="elements to show (default: periods 1-3)")
+    args = parser.parse_args()
+
+    dataset = load_dataset()
+    table = zeff_table(dataset).set_axis(dataset["Symbol"].astype(str))
+    table = table.loc[args.symbols] if args.symbols else table.iloc[:18]
+    print(table.dropna(axis=1, how="all").round(2).to_string(na_rep=""))
@@ -1,97 +1,61 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
-import time
+
+from neutralization import ACID, BASE, COLLISION_THRESHOLD, WATER, ParticleStore, attraction_displacements, find_reactions, make_rng
+from neutralization_session import FramePacer, SimulationSession, session_controls
+from particle_view import CAPITALIZED_LABELS, EffectBuffer, ParticleRenderer
+
+# Reaction effects grow from 0.05 to just under 0.15 over 19 steps, then vanish
+EFFECT_LIFETIME = 19
 
 # Initialize particles
-def initialize_particles(acid_count, base_count):
-    acid_positions = np.random.rand(acid_count, 2)  # Random positions for acid
-    base_positions = np.random.rand(base_count, 2)  # Random positions for base
-    water_positions = np.empty((0, 2))  # Initially no water molecules
-    reaction_effects = np.empty((0, 3))  # [x, y, size] for reaction effects
-    return acid_positions, base_positions, water_positions, reaction_effects
-
-# Update particle positions and simulate reaction with adjustable attraction
-def update_particles(acid_positions, base_positions, water_positions, reaction_effects, attraction_strength):
-    reacted_pairs = 0
-    new_water_positions = []
-    new_effect_positions = []
-
-    # Apply attraction force between H⁺ and OH⁻
-    for acid in acid_positions:
-        for base in base_positions:
-            direction = base - acid
-            distance = np.linalg.norm(direction)
-            if distance > 0:  # Avoid division by zero
-                attraction_force = attraction_strength * direction / distance
-                acid += attraction_force
-                base -= attraction_force
-
-    # Check for collisions and react
-    i = 0
-    while i < len(acid_positions):
-        j = 0
-        while j < len(base_positions):
-            if np.linalg.norm(acid_positions[i] - base_positions[j]) < 0.05:  # Collision threshold
-                new_water_positions.append((acid_positions[i] + base_positions[j]) / 2)
-                new_effect_positions.append([acid_positions[i, 0], acid_positions[i, 1], 0.05])  # Initial effect size
-                acid_positions = np.delete(acid_positions, i, axis=0)
-                base_positions = np.delete(base_positions, j, axis=0)
-                reacted_pairs += 1
-                break
-            else:
-                j += 1
-        else:
-            i += 1
-
-    # Add water positions if any reactions occurred
-    if new_water_positions:
-        new_water_positions = np.array(new_water_positions)
-        water_positions = np.vstack([water_positions, new_water_positions])
-
-    # Add new reaction effects
-    if new_effect_positions:
-        new_effect_positions = np.array(new_effect_positions)
-        reaction_effects = np.vstack([reaction_effects, new_effect_positions])
-
-    # Update existing reaction effects (increase size and fade out)
-    if len(reaction_effects) > 0:
-        reaction_effects[:, 2] += 0.005  # Increase effect size
-        reaction_effects = reaction_effects[reaction_effects[:, 2] < 0.15]  # Remove effects that are too large
-
-    # Random motion for remaining particles
-    acid_positions += np.random.uniform(-0.03, 0.03, acid_positions.shape)
-    base_positions += np.random.uniform(-0.03, 0.03, base_positions.shape)
-    water_positions += np.random.uniform(-0.015, 0.015, water_positions.shape)
-
-    # Keep particles within bounds
-    acid_positions = np.clip(acid_positions, 0, 1)
-    base_positions = np.clip(base_positions, 0, 1)
-    water_positions = np.clip(water_positions, 0, 1)
-
-    return acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects
-
-# Plot the particles
-def plot_particles(acid_positions, base_positions, water_positions, reaction_effects):
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-
-    # Plot particles
-    ax.scatter(acid_positions[:, 0], acid_positions[:, 1], color='red', label="H⁺ (Acid)", s=50)
-    ax.scatter(base_positions[:, 0], base_positions[:, 1], color='blue', label="OH⁻ (Base)", s=50)
-    ax.scatter(water_positions[:, 0], water_positions[:, 1], color='yellow', label="H₂O (Water)", s=50)
-
-    # Plot reaction effects
-    for effect in reaction_effects:
-        circle = plt.Circle((effect[0], effect[1]), effect[2], color='green', alpha=0.5)
-        ax.add_patch(circle)
-
-    ax.legend()
-    ax.set_title("Neutralization Reaction Simulation with Adjustable Attraction")
-    ax.axis("off")
-    return fig
+def initialize_particles(acid_count, base_count, rng=None):
+    rng = make_rng(rng)
+    particles = ParticleStore()
+    particles.append(rng.random((acid_count, 2)), ACID)  # Random positions for acid
+    particles.append(rng.random((base_count, 2)), BASE)  # Random positions for base
+    return particles  # Water molecules are added as they form
+
+# Update particle positions and simulate reaction with adjustable attraction (in place)
+def update_particles(particles, attraction_strength, rng=None, effects=None):
+    # Apply attraction force between H⁺ and OH⁻ (all pairs at once, order-independent)
+    acid_slots = particles.indices(ACID)
+    base_slots = particles.indices(BASE)
+    acid_shift, base_shift = attraction_displacements(
+        particles.positions[acid_slots], particles.positions[base_slots], attraction_strength
+    )
+    particles.positions[acid_slots] += acid_shift
+    particles.positions[base_slots] += base_shift
+
+    # Check for collisions and react (cell-list neighbour search, one-to-one matching)
+    acid_idx, base_idx = find_reactions(particles.positions[acid_slots], particles.positions[base_slots], COLLISION_THRESHOLD)
+    reacted_pairs = len(acid_idx)
+    acid_slots, base_slots = acid_slots[acid_idx], base_slots[base_idx]
+    new_water_positions = (particles.positions[acid_slots] + particles.positions[base_slots]) / 2
+    new_effect_positions = particles.positions[acid_slots]  # Effects start at the acid position
+
+    # Reacted H⁺ become water, reacted OH⁻ are retired
+    particles.react(acid_slots, base_slots, new_water_positions)
+
+    # Update existing reaction effects (grow and fade out) and add new ones
+    if effects is not None:
+        effects.tick()
+        effects.add(new_effect_positions)
+
+    # Random motion for remaining particles, kept within bounds
+    particles.move(rng)
+
+    return reacted_pairs
+
+# Plot the particles on the persistent figure
+def plot_particles(renderer, particles, effects):
+    # Plot reaction effects: size starts at 0.05 and grows by 0.005 per step
+    effect_positions, effect_ages = effects.live()
+    effect_radii = 0.05 + 0.005 * (effect_ages + 1)  # Increase effect size
+    return renderer.update(
+        particles.positions_of(ACID), particles.positions_of(BASE), particles.positions_of(WATER),
+        effect_positions, effect_radii, effects.alphas(effect_ages),
+    )
 
 # Streamlit App
 st.title("중화 반응 모형")
@@ -99,44 +63,53 @@ st.title("중화 반응 모형")
 st.sidebar.header("반응 초기 조건 설정")
 acid_count = st.sidebar.slider("Number of Acid Particles (H⁺)", 1, 50, 10, 1)
 base_count = st.sidebar.slider("Number of Base Particles (OH⁻)", 1, 50, 10, 1)
+seed = st.sidebar.number_input("Random Seed (0 = random)", 0, 2**32 - 1, 0, 1)  # Same seed, same run
 
-# Attraction slider
+# Attraction slider (applies to a running simulation on the next step)
 attraction_strength = st.sidebar.slider("Adjust Attraction Strength", 0.001, 0.05, 0.01, 0.001)
 
-if st.button("반응 시작"):
-    with st.spinner("Running simulation..."):
-        # Initialize particles
-        acid_positions, base_positions, water_positions, reaction_effects = initialize_particles(acid_count, base_count)
-
-        total_reacted_pairs = 0
-        animation_placeholder = st.empty()
-        table_placeholder = st.empty()
-
-        # Run the animation
-        while len(acid_positions) > 0 and len(base_positions) > 0:  # Stop when all particles have reacted
-            # Update attraction strength in real-time
-            attraction_strength = st.sidebar.slider("Adjust Attraction Strength", 0.001, 0.05, 0.01, 0.001)
-
-            acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects = update_particles(
-                acid_positions, base_positions, water_positions, reaction_effects, attraction_strength
-            )
-            total_reacted_pairs += reacted_pairs
-            fig = plot_particles(acid_positions, base_positions, water_positions, reaction_effects)
-
-            # Update table
-            reacted_acid_count = -(acid_count - len(acid_positions))  # Negative for reacted acids
-            reacted_base_count = -(base_count - len(base_positions))  # Negative for reacted bases
-            created_water_count = f"+{len(water_positions)}"  # Positive with + for water molecules
+# The run lives in st.session_state, so it can be paused, stepped and resumed, and
+# moving the attraction slider changes the running simulation instead of restarting it
+def new_session():
+    rng = make_rng(seed or None)
+    renderer = ParticleRenderer("Neutralization Reaction Simulation with Adjustable Attraction", CAPITALIZED_LABELS)
+    return SimulationSession(initialize_particles(acid_count, base_count, rng), EffectBuffer(EFFECT_LIFETIME), rng, renderer)
+
+session, single_step = session_controls("attraction_neutralization", new_session)
+if session is not None:
+    animation_placeholder = st.empty()
+    table_placeholder = st.empty()
+    initial_counts = session.initial_counts
+    pacer = FramePacer()
+
+    def show(force_table=False):
+        fig = plot_particles(session.renderer, session.particles, session.effects)
+
+        # Update table
+        counts = session.particles.counts()
+        if pacer.table_due(tuple(counts), force_table or session.done):
+            reacted_acid_count = -(initial_counts[ACID] - counts[ACID])  # Negative for reacted acids
+            reacted_base_count = -(initial_counts[BASE] - counts[BASE])  # Negative for reacted bases
+            created_water_count = f"+{counts[WATER]}"  # Positive with + for water molecules
 
             results = {
                 "Particle Type": ["H⁺ (Acid)", "OH⁻ (Base)", "H₂O (Water)"],
-                "Initial Count": [acid_count, base_count, 0],
+                "Initial Count": [initial_counts[ACID], initial_counts[BASE], 0],
                 "Reacted (Generated)": [reacted_acid_count, reacted_base_count, created_water_count],
-                "Remaining": [len(acid_positions), len(base_positions), len(water_positions)],
+                "Remaining": [counts[ACID], counts[BASE], counts[WATER]],
             }
             table_placeholder.table(pd.DataFrame(results))
 
-            animation_placeholder.pyplot(fig)
-            time.sleep(0.01)  # 1/100 second update time
+        animation_placeholder.pyplot(fig)
+
+    if single_step and not session.done:
+        session.advance(update_particles, attraction_strength)
+    show(force_table=True)
+
+    # Run the animation, several steps per frame, until paused or all particles have reacted
+    for _ in session.run(update_particles, attraction_strength, pacer=pacer):
+        show()
+        pacer.wait()
 
+    if session.done:
         st.success("Reaction completed!")
@@ -1,87 +1,55 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
-import time
+
+from neutralization import ACID, BASE, COLLISION_THRESHOLD, WATER, ParticleStore, find_reactions, make_rng
+from neutralization_session import FramePacer, SimulationSession, session_controls
+from particle_view import CAPITALIZED_LABELS, EffectBuffer, ParticleRenderer
+
+# Reaction effects grow from 0.05 to just under 0.15 over 19 steps, then vanish
+EFFECT_LIFETIME = 19
 
 # Initialize particles
-def initialize_particles(acid_count, base_count):
-    acid_positions = np.random.rand(acid_count, 2)  # Random positions for acid
-    base_positions = np.random.rand(base_count, 2)  # Random positions for base
-    water_positions = np.empty((0, 2))  # Initially no water molecules
-    reaction_effects = np.empty((0, 3))  # [x, y, size] for reaction effects
-    return acid_positions, base_positions, water_positions, reaction_effects
-
-# Update particle positions and simulate reaction
-def update_particles(acid_positions, base_positions, water_positions, reaction_effects):
-    reacted_pairs = 0
-    new_water_positions = []
-    new_effect_positions = []
-
-    # Check for collisions (simplified proximity check)
-    i = 0
-    while i < len(acid_positions):
-        j = 0
-        while j < len(base_positions):
-            if np.linalg.norm(acid_positions[i] - base_positions[j]) < 0.05:  # Collision threshold
-                new_water_positions.append((acid_positions[i] + base_positions[j]) / 2)
-                new_effect_positions.append([acid_positions[i, 0], acid_positions[i, 1], 0.05])  # Initial effect size (reduced)
-                acid_positions = np.delete(acid_positions, i, axis=0)
-                base_positions = np.delete(base_positions, j, axis=0)
-                reacted_pairs += 1
-                break
-            else:
-                j += 1
-        else:
-            i += 1
-
-    # Add water positions if any reactions occurred
-    if new_water_positions:
-        new_water_positions = np.array(new_water_positions)
-        water_positions = np.vstack([water_positions, new_water_positions])
-
-    # Add new reaction effects
-    if new_effect_positions:
-        new_effect_positions = np.array(new_effect_positions)
-        reaction_effects = np.vstack([reaction_effects, new_effect_positions])
-
-    # Update existing reaction effects (increase size and fade out)
-    if len(reaction_effects) > 0:
-        reaction_effects[:, 2] += 0.005  # Increase effect size (slower growth due to smaller size)
-        reaction_effects = reaction_effects[reaction_effects[:, 2] < 0.15]  # Remove effects that are too large
-
-    # Random motion for remaining particles
-    acid_positions += np.random.uniform(-0.03, 0.03, acid_positions.shape)
-    base_positions += np.random.uniform(-0.03, 0.03, base_positions.shape)
-    water_positions += np.random.uniform(-0.015, 0.015, water_positions.shape)
-
-    # Keep particles within bounds
-    acid_positions = np.clip(acid_positions, 0, 1)
-    base_positions = np.clip(base_positions, 0, 1)
-    water_positions = np.clip(water_positions, 0, 1)
-
-    return acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects
-
-# Plot the particles
-def plot_particles(acid_positions, base_positions, water_positions, reaction_effects):
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-
-    # Plot particles
-    ax.scatter(acid_positions[:, 0], acid_positions[:, 1], color='red', label="H⁺ (Acid)", s=50)
-    ax.scatter(base_positions[:, 0], base_positions[:, 1], color='blue', label="OH⁻ (Base)", s=50)
-    ax.scatter(water_positions[:, 0], water_positions[:, 1], color='yellow', label="H₂O (Water)", s=50)
-
-    # Plot reaction effects
-    for effect in reaction_effects:
-        circle = plt.Circle((effect[0], effect[1]), effect[2], color='green', alpha=0.5)
-        ax.add_patch(circle)
-
-    ax.legend()
-    ax.set_title("Simple Neutralization Reaction Simulation")
-    ax.axis("off")
-    return fig
+def initialize_particles(acid_count, base_count, rng=None):
+    rng = make_rng(rng)
+    particles = ParticleStore()
+    particles.append(rng.random((acid_count, 2)), ACID)  # Random positions for acid
+    particles.append(rng.random((base_count, 2)), BASE)  # Random positions for base
+    return particles  # Water molecules are added as they form
+
+# Update particle positions and simulate reaction (in place)
+def update_particles(particles, rng=None, effects=None):
+
+    # Check for collisions (cell-list neighbour search, one-to-one matching)
+    acid_slots = particles.indices(ACID)
+    base_slots = particles.indices(BASE)
+    acid_idx, base_idx = find_reactions(particles.positions[acid_slots], particles.positions[base_slots], COLLISION_THRESHOLD)
+    reacted_pairs = len(acid_idx)
+    acid_slots, base_slots = acid_slots[acid_idx], base_slots[base_idx]
+    new_water_positions = (particles.positions[acid_slots] + particles.positions[base_slots]) / 2
+    new_effect_positions = particles.positions[acid_slots]  # Effects start at the acid position
+
+    # Reacted H⁺ become water, reacted OH⁻ are retired
+    particles.react(acid_slots, base_slots, new_water_positions)
+
+    # Update existing reaction effects (grow and fade out) and add new ones
+    if effects is not None:
+        effects.tick()
+        effects.add(new_effect_positions)
+
+    # Random motion for remaining particles, kept within bounds
+    particles.move(rng)
+
+    return reacted_pairs
+
+# Plot the particles on the persistent figure
+def plot_particles(renderer, particles, effects):
+    # Plot reaction effects: size starts at 0.05 and grows by 0.005 per step
+    effect_positions, effect_ages = effects.live()
+    effect_radii = 0.05 + 0.005 * (effect_ages + 1)  # Increase effect size (slower growth due to smaller size)
+    return renderer.update(
+        particles.positions_of(ACID), particles.positions_of(BASE), particles.positions_of(WATER),
+        effect_positions, effect_radii, effects.alphas(effect_ages),
+    )
 
 # Streamlit App
 st.title("간단한 중화 반응 시뮬레이션")
@@ -89,38 +57,49 @@ st.title("간단한 중화 반응 시뮬레이션")
 st.sidebar.header("입자 설정")
 acid_count = st.sidebar.slider("산 입자 수 (H⁺)", 0, 50, 25, 1)
 base_count = st.sidebar.slider("염기 입자 수 (OH⁻)", 0, 50, 25, 1)
-
-if st.button("반응 시작"):
-    with st.spinner("반응 시뮬레이션 실행 중..."):
-        # Initialize particles
-        acid_positions, base_positions, water_positions, reaction_effects = initialize_particles(acid_count, base_count)
-
-        total_reacted_pairs = 0
-        animation_placeholder = st.empty()
-        table_placeholder = st.empty()
-
-        # Run the animation
-        while len(acid_positions) > 0 and len(base_positions) > 0:  # Stop when all particles have reacted
-            acid_positions, base_positions, water_positions, reacted_pairs, reaction_effects = update_particles(
-                acid_positions, base_positions, water_positions, reaction_effects
-            )
-            total_reacted_pairs += reacted_pairs
-            fig = plot_particles(acid_positions, base_positions, water_positions, reaction_effects)
-
-            # Update table
-            reacted_acid_count = -(acid_count - len(acid_positions))  # Negative for reacted acids
-            reacted_base_count = -(base_count - len(base_positions))  # Negative for reacted bases
-            created_water_count = f"+{len(water_positions)}"  # Positive with + for water molecules
+seed = st.sidebar.number_input("난수 시드 (0 = 무작위)", 0, 2**32 - 1, 0, 1)  # Same seed, same run
+
+# The run lives in st.session_state, so it can be paused, stepped and resumed
+def new_session():
+    rng = make_rng(seed or None)
+    renderer = ParticleRenderer("Simple Neutralization Reaction Simulation", CAPITALIZED_LABELS)
+    return SimulationSession(initialize_particles(acid_count, base_count, rng), EffectBuffer(EFFECT_LIFETIME), rng, renderer)
+
+session, single_step = session_controls("simple_neutralization", new_session)
+if session is not None:
+    animation_placeholder = st.empty()
+    table_placeholder = st.empty()
+    initial_counts = session.initial_counts
+    pacer = FramePacer()
+
+    def show(force_table=False):
+        fig = plot_particles(session.renderer, session.particles, session.effects)
+
+        # Update table
+        counts = session.particles.counts()
+        if pacer.table_due(tuple(counts), force_table or session.done):
+            reacted_acid_count = -(initial_counts[ACID] - counts[ACID])  # Negative for reacted acids
+            reacted_base_count = -(initial_counts[BASE] - counts[BASE])  # Negative for reacted bases
+            created_water_count = f"+{counts[WATER]}"  # Positive with + for water molecules
 
             results = {
                 "입자 종류": ["H⁺ (산)", "OH⁻ (염기)", "H₂O (물)"],
-                "초기 개수": [acid_count, base_count, 0],
+                "초기 개수": [initial_counts[ACID], initial_counts[BASE], 0],
                 "반응한(생성된) 개수": [reacted_acid_count, reacted_base_count, created_water_count],
-                "남은 개수": [len(acid_positions), len(base_positions), len(water_positions)],
+                "남은 개수": [counts[ACID], counts[BASE], counts[WATER]],
             }
             table_placeholder.table(pd.DataFrame(results))
 
-            animation_placeholder.pyplot(fig)
-            time.sleep(0.001)  # 1/1000 second update time
+        animation_placeholder.pyplot(fig)
+
+    if single_step and not session.done:
+        session.advance(update_particles)
+    show(force_table=True)
+
+    # Run the animation, several steps per frame, until paused or all particles have reacted
+    for _ in session.run(update_particles, pacer=pacer):
+        show()
+        pacer.wait()
 
+    if session.done:
         st.success("모든 반응이 완료되었습니다!")